@@ -0,0 +1,144 @@
+"""
+On-disk caches for data that rarely changes between scans (type names, system names, jump distances).
+
+Each named cache is a PersistentCache: a dictionary held in memory for fast lookups and
+backed by a shelve file in config.CACHE_DIR, so every new entry is written through to disk
+as soon as it is stored and survives the process being killed. Loaded caches are shared by
+everything in the process and synced when the service stops or the process exits.
+"""
+import ast
+import atexit
+import logging
+import os
+import shelve
+import threading
+from collections.abc import MutableMapping
+from typing import Any, Dict, Hashable, Iterator
+
+import config
+
+# Set up logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+class PersistentCache(MutableMapping):
+    """
+    Dictionary backed by a shelve file.
+
+    Reads are served from an in-memory copy loaded when the cache is opened; writes update
+    that copy and the shelf together. Shelve only accepts string keys, so keys are stored
+    as their repr() and must be literals (ints, strings or tuples of them).
+    """
+
+    def __init__(self, path: str):
+        """
+        Open (or create) a persistent cache.
+
+        Args:
+            path: Path of the shelve file, without the extension dbm adds
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        self._data: Dict[Hashable, Any] = {}
+        self._shelf = None
+
+        try:
+            os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+            self._shelf = shelve.open(path, writeback=False)
+            for key in self._shelf.keys():
+                self._data[ast.literal_eval(key)] = self._shelf[key]
+        except Exception as e:
+            # Keep working from memory only; the cache is an optimisation, not a requirement
+            logger.warning(f"Could not open cache file {path}, caching in memory only: {e}")
+            self.close()
+            self._data = {}
+
+    def __getitem__(self, key: Hashable) -> Any:
+        return self._data[key]
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._data
+
+    def __setitem__(self, key: Hashable, value: Any) -> None:
+        with self._lock:
+            self._data[key] = value
+            if self._shelf is not None:
+                try:
+                    self._shelf[repr(key)] = value
+                except Exception as e:
+                    logger.warning(f"Could not write to cache file {self.path}: {e}")
+
+    def __delitem__(self, key: Hashable) -> None:
+        with self._lock:
+            del self._data[key]
+            if self._shelf is not None:
+                self._shelf.pop(repr(key), None)
+
+    def __iter__(self) -> Iterator[Hashable]:
+        return iter(self._data)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def sync(self) -> None:
+        """Flush pending writes to disk."""
+        with self._lock:
+            if self._shelf is not None:
+                try:
+                    self._shelf.sync()
+                except Exception as e:
+                    logger.warning(f"Could not sync cache file {self.path}: {e}")
+
+    def close(self) -> None:
+        """Sync and close the backing shelf; the in-memory copy stays usable."""
+        with self._lock:
+            if self._shelf is not None:
+                try:
+                    self._shelf.close()
+                except Exception as e:
+                    logger.warning(f"Could not close cache file {self.path}: {e}")
+                self._shelf = None
+
+# Caches opened so far in this process, by name
+_caches: Dict[str, PersistentCache] = {}
+_caches_lock = threading.Lock()
+
+def _cache_path(name: str) -> str:
+    """Get the path of the shelve file backing a named cache."""
+    return os.path.join(config.CACHE_DIR, name)
+
+def get_cache(name: str) -> PersistentCache:
+    """
+    Get a named persistent cache, opening it from disk on first use.
+
+    Args:
+        name: Name of the cache (used as the file name)
+
+    Returns:
+        The cache; entries stored in it are written through to disk
+    """
+    with _caches_lock:
+        if name not in _caches:
+            _caches[name] = PersistentCache(_cache_path(name))
+            if _caches[name]:
+                logger.info(f"Loaded {len(_caches[name])} entries from cache '{name}'")
+        return _caches[name]
+
+def flush_caches() -> None:
+    """Sync every opened cache to disk."""
+    with _caches_lock:
+        caches = list(_caches.values())
+    for cache in caches:
+        cache.sync()
+
+def close_caches() -> None:
+    """Sync and close every opened cache."""
+    with _caches_lock:
+        caches = list(_caches.values())
+    for cache in caches:
+        cache.close()
+
+atexit.register(close_caches)
@@ -26,6 +26,13 @@ UNIVERSE_TYPES_ENDPOINT = f"{ESI_BASE_URL}/universe/types/{{type_id}}/"
 UNIVERSE_SYSTEMS_ENDPOINT = f"{ESI_BASE_URL}/universe/systems/{{system_id}}/"
 UNIVERSE_REGIONS_ENDPOINT = f"{ESI_BASE_URL}/universe/regions/{{region_id}}/"
 ROUTE_ENDPOINT = f"{ESI_BASE_URL}/route/{{origin}}/{{destination}}/"
+UNIVERSE_NAMES_ENDPOINT = f"{ESI_BASE_URL}/universe/names/"
+
+# Maximum number of concurrent ESI market order requests (kept well under ESI's error-limit budget)
+ESI_MAX_WORKERS = int(os.getenv('ESI_MAX_WORKERS', '16'))
+
+# How long (in seconds) fetched Jita prices are reused before being refreshed in the background
+JITA_PRICE_TTL_SECONDS = int(os.getenv('JITA_PRICE_TTL_SECONDS', '900'))
 
 # Region IDs
 # The Forge (contains Jita)
@@ -40,6 +47,12 @@ DEVOID_REGION_ID = 10000036       # Devoid
 # Path to the solar system data file
 SOLAR_SYSTEM_DATA_PATH = os.getenv('SOLAR_SYSTEM_DATA_PATH', 'solar_systems.pickle')
 
+# Directory for the scanners' persistent type name, system name and jump distance caches
+CACHE_DIR = os.getenv('CACHE_DIR', '.cache')
+
+# How long (in hours) the ship data cache file is used before it is rebuilt
+SHIP_DATA_CACHE_TTL_HOURS = float(os.getenv('SHIP_DATA_CACHE_TTL_HOURS', '24'))
+
 # Fallback list of regions to search for orders if solar system data is not available
 FALLBACK_REGION_IDS = [
     LONETREK_REGION_ID,
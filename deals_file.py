@@ -0,0 +1,32 @@
+"""
+Saving scan results (deals) to disk.
+"""
+import logging
+import os
+
+# Set up logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+def write_deals_file(filename: str, payload: bytes) -> None:
+    """
+    Write a deals file atomically (runs on a background I/O thread).
+    
+    Args:
+        filename: Path of the file to write
+        payload: Serialized deals
+    """
+    try:
+        # Write to a temporary file first so readers never see a partial file
+        tmp_path = f"{filename}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(payload)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, filename)
+        logger.info(f"Saved deals to {filename}")
+    except OSError as e:
+        logger.error(f"Could not save deals to {filename}: {e}")
@@ -4,13 +4,17 @@ Enhanced market scanner for finding good deals on EVE Online ship hulls.
 This version uses locally downloaded EVERef market data snapshots for faster market data retrieval.
 """
 import logging
-import os
-from typing import Dict, List
-from collections import defaultdict
+import threading
+import time
+from typing import Dict, List, Optional
+from concurrent.futures import ThreadPoolExecutor
 
+import numpy as np
+
+from cache import get_cache
 from esi_client import ESIClient
 from everef_market_client import EVERefMarketClient
-from solar_system_data import get_regions_to_search
+from solar_system_data import get_regions_to_search, get_system_index, build_distance_table, NOT_ON_MAP
 import config
 from ship_hulls import get_ship_info
 
@@ -20,10 +24,60 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Config setting holding the type IDs for each ship type. Settings are looked up when
+# used rather than copied here, because main.py can override them (e.g. --hulls).
+SHIP_TYPE_ID_SETTINGS = {
+    'battleship': 'ALL_BATTLESHIP_TYPE_IDS',
+    'cruiser': 'ALL_CRUISER_TYPE_IDS',
+    'command_ship': 'ALL_COMMAND_SHIP_TYPE_IDS',
+}
+
+def get_type_ids_for_ship_type(ship_type: str) -> List[int]:
+    """Get the configured type IDs for a ship type, defaulting to battleships for unknown types."""
+    setting = SHIP_TYPE_ID_SETTINGS.get(ship_type)
+    if setting is None:
+        logger.warning(f"Unknown ship type: {ship_type}, defaulting to battleships")
+        setting = SHIP_TYPE_ID_SETTINGS['battleship']
+    return getattr(config, setting)
+
+def lowest_prices_in_system(orders, type_ids, system_id: int) -> Dict[int, float]:
+    """
+    Get the lowest price per type among the orders located in one system.
+    
+    Args:
+        orders: Iterable of market orders (ESI or EVERef format) for any mix of types
+        type_ids: Type IDs to report
+        system_id: Only orders in this system are considered
+    
+    Returns:
+        Dictionary mapping type ID to its lowest price; types without orders are omitted
+    """
+    local_orders = [order for order in orders if order.get('system_id') == system_id]
+    if not local_orders:
+        return {}
+    
+    count = len(local_orders)
+    order_type_ids = np.fromiter((order.get('type_id', -1) for order in local_orders), dtype=np.int64, count=count)
+    prices = np.fromiter((order.get('price', float('inf')) for order in local_orders), dtype=np.float64, count=count)
+    
+    # Sort by type so each type's orders are contiguous, then take every group's minimum at once
+    by_type = np.argsort(order_type_ids, kind='stable')
+    order_type_ids = order_type_ids[by_type]
+    group_starts = np.flatnonzero(np.r_[True, order_type_ids[1:] != order_type_ids[:-1]])
+    group_minimums = np.minimum.reduceat(prices[by_type], group_starts)
+    
+    wanted = set(type_ids)
+    return {
+        type_id: price
+        for type_id, price in zip(order_type_ids[group_starts].tolist(), group_minimums.tolist())
+        if type_id in wanted
+    }
+
 class EnhancedMarketScanner:
     """Enhanced scanner for finding good deals on ship hulls using EVERef data."""
     
-    def __init__(self, reference_system_id=None, reference_system_name=None, use_everef=True):
+    def __init__(self, reference_system_id=None, reference_system_name=None, use_everef=True, esi_client=None,
+                 max_jumps=None, hull_ids=None):
         """
         Initialize the enhanced market scanner.
         
@@ -31,17 +85,33 @@ class EnhancedMarketScanner:
             reference_system_id: ID of the reference system
             reference_system_name: Name of the reference system
             use_everef: Whether to use EVERef market data (faster) or ESI API (slower)
+            esi_client: Optional ESI client to reuse instead of creating a new one
+            max_jumps: Maximum jumps from the reference system (defaults to config.MAX_JUMPS)
+            hull_ids: Optional hull type IDs to scan instead of the configured ones for the ship type
         """
-        self.esi_client = ESIClient()
+        self.esi_client = esi_client or ESIClient()
         self.everef_client = EVERefMarketClient() if use_everef else None
         self.use_everef = use_everef
         
-        self.type_names = {}
-        self.system_names = {}
-        self.system_distances = {}
-        
         self.reference_system_id = reference_system_id or config.REFERENCE_SYSTEM_ID
         self.reference_system_name = reference_system_name or config.REFERENCE_SYSTEM_NAME
+        self.max_jumps = config.MAX_JUMPS if max_jumps is None else max_jumps
+        self.hull_ids = hull_ids
+        
+        # Names and distances rarely change, so they are kept on disk across runs
+        self.type_names = get_cache('type_names')
+        self.system_names = get_cache('system_names')
+        self.system_distances = get_cache('system_distances')  # keyed by (system, reference)
+        self._distance_table = None  # (reference system ID, build_distance_table result)
+        
+        # Jita prices by (ship type, type IDs) -> (fetch time, prices), reused across scans
+        self._jita_price_cache = {}
+        self._jita_refreshing = set()
+        self._jita_lock = threading.Lock()
+    
+    def get_type_ids(self, ship_type: str) -> List[int]:
+        """Get the hull type IDs to scan for a ship type (the scanner's own hull_ids if given)."""
+        return self.hull_ids or get_type_ids_for_ship_type(ship_type)
     
     def get_type_name(self, type_id: int) -> str:
         """Get the name of a type."""
@@ -53,59 +123,232 @@ class EnhancedMarketScanner:
             else:
                 # Fall back to ESI API if not found in static data
                 type_info = self.esi_client.get_type_info(type_id)
-                self.type_names[type_id] = type_info.get('name', f'Unknown Type {type_id}')
+                if 'name' not in type_info:
+                    # Don't persist failed lookups
+                    return f'Unknown Type {type_id}'
+                self.type_names[type_id] = type_info['name']
         return self.type_names[type_id]
     
     def get_system_name(self, system_id: int) -> str:
         """Get the name of a system."""
         if system_id not in self.system_names:
             system_info = self.esi_client.get_system_info(system_id)
-            self.system_names[system_id] = system_info.get('name', f'Unknown System {system_id}')
+            if 'name' not in system_info:
+                # Don't persist failed lookups
+                return f'Unknown System {system_id}'
+            self.system_names[system_id] = system_info['name']
         return self.system_names[system_id]
     
+    def prefetch_names(self, type_ids=(), system_ids=()) -> None:
+        """
+        Resolve the names of many types and systems in bulk and cache them.
+        
+        Names that are already cached or found in the static ship hull data are skipped;
+        the rest are resolved with batched /universe/names/ requests instead of one
+        request per ID. Anything left unresolved is looked up individually on demand.
+        
+        Args:
+            type_ids: Type IDs whose names will be needed
+            system_ids: System IDs whose names will be needed
+        """
+        missing = []
+        for type_id in type_ids:
+            if type_id not in self.type_names:
+                ship_info = get_ship_info(type_id)
+                if ship_info["name"] != f"Unknown Type {type_id}":
+                    self.type_names[type_id] = ship_info["name"]
+                else:
+                    missing.append(type_id)
+        missing_types = set(missing)
+        missing.extend(system_id for system_id in set(system_ids) if system_id and system_id not in self.system_names)
+        
+        if not missing:
+            return
+        
+        logger.info(f"Resolving {len(missing)} names in bulk")
+        for entity_id, name in self.esi_client.get_names(missing).items():
+            if entity_id in missing_types:
+                self.type_names[entity_id] = name
+            else:
+                self.system_names[entity_id] = name
+    
+    def prefetch_distances(self, system_ids) -> None:
+        """
+        Resolve jump distances for systems that are not on the local stargate map, concurrently.
+        
+        Systems on the map are answered from the distance array; the rest need one ESI
+        route request each, which are independent and run in a thread pool.
+        
+        Args:
+            system_ids: System IDs whose distances will be needed
+        """
+        system_index = get_system_index(config.SOLAR_SYSTEM_DATA_PATH)
+        missing = {
+            system_id for system_id in system_ids
+            if system_id
+            and system_id != self.reference_system_id
+            and system_id not in system_index
+            and (system_id, self.reference_system_id) not in self.system_distances
+        }
+        if not missing:
+            return
+        
+        logger.info(f"Resolving {len(missing)} jump distances through the ESI API")
+        with ThreadPoolExecutor(max_workers=config.ESI_MAX_WORKERS) as executor:
+            list(executor.map(self.get_distance_to_reference, missing))
+    
     def get_distance_to_reference(self, system_id: int) -> int:
         """Get the distance from a system to the reference system."""
         if system_id == self.reference_system_id:
             return 0
         
+        # Use the stargate map when the system is on it: one BFS per reference system,
+        # flattened into a table indexed by system ID
+        distance_table = self._distance_table
+        if distance_table is None or distance_table[0] != self.reference_system_id:
+            distance_table = (self.reference_system_id, build_distance_table(self.reference_system_id, config.SOLAR_SYSTEM_DATA_PATH))
+            self._distance_table = distance_table
+        if distance_table[1] is not None:
+            base, distances = distance_table[1]
+            offset = system_id - base
+            if 0 <= offset < len(distances) and distances[offset] != NOT_ON_MAP:
+                return distances[offset]
+        
+        # Otherwise ask the ESI API for the route
         cache_key = (system_id, self.reference_system_id)
         if cache_key not in self.system_distances:
             distance = self.esi_client.get_jump_distance(system_id, self.reference_system_id)
+            if distance == 999:
+                # No route, possibly because the request failed; don't persist it
+                return distance
             self.system_distances[cache_key] = distance
         
         return self.system_distances[cache_key]
     
-    def fetch_ship_orders(self, ship_type='battleship') -> Dict[int, List[Dict]]:
+    def _select_nearby_orders(self, orders) -> List[Dict]:
+        """
+        Keep the orders above MIN_PRICE that are within max_jumps of the reference system.
+        
+        Both filters run in a single pass, and each kept order gets its
+        'distance_to_reference' set.
+        
+        Args:
+            orders: Iterable of sell orders
+            
+        Returns:
+            List of the nearby orders
+        """
+        # Hoisted out of the loop, which can run over whole regional order books
+        min_price = config.MIN_PRICE
+        max_jumps = self.max_jumps
+        get_distance = self.get_distance_to_reference
+        
+        nearby_orders = []
+        for order in orders:
+            system_id = order.get('system_id')
+            if not system_id or order.get('price', 0) < min_price:
+                continue
+            distance = get_distance(system_id)
+            if distance <= max_jumps:
+                order['distance_to_reference'] = distance
+                nearby_orders.append(order)
+        return nearby_orders
+    
+    def _add_nearby_orders(self, type_ids, orders_for_type, orders_by_type, jita_prices=None):
+        """
+        Filter each type's orders down to nearby candidates and add them to orders_by_type.
+        
+        System names are resolved (in bulk) only for the orders that are kept.
+        
+        Args:
+            type_ids: Type IDs to process
+            orders_for_type: Mapping from type ID to a list of that type's sell orders
+            orders_by_type: Dictionary the nearby orders are added to
+            jita_prices: Optional lowest Jita price per type ID, used to skip hulls that cannot beat Jita
+        """
+        # Route lookups for systems off the local map are slow, so do them all at once up front
+        self.prefetch_distances(
+            order.get('system_id')
+            for type_id in type_ids
+            for order in orders_for_type.get(type_id, [])
+            if order.get('price', 0) >= config.MIN_PRICE
+        )
+        
+        nearby_by_type = {}
+        for type_id in type_ids:
+            type_name = self.get_type_name(type_id)
+            logger.info(f"Processing orders for {type_name} (Type ID: {type_id})")
+            
+            nearby_orders = self._select_nearby_orders(orders_for_type.get(type_id, []))
+            if not nearby_orders:
+                logger.info(f"No nearby sell orders found for {type_name}")
+                continue
+            
+            if not self._can_beat_jita(type_id, nearby_orders, jita_prices):
+                logger.info(f"Skipping {type_name}: no nearby sell order at or below the Jita price")
+                continue
+            
+            nearby_by_type[type_id] = nearby_orders
+        
+        # Resolve the system names of all kept orders in one go
+        self.prefetch_names(system_ids=[
+            order['system_id']
+            for nearby_orders in nearby_by_type.values()
+            for order in nearby_orders
+        ])
+        
+        for type_id, nearby_orders in nearby_by_type.items():
+            for order in nearby_orders:
+                order['system_name'] = self.get_system_name(order['system_id'])
+            
+            logger.info(f"Found {len(nearby_orders)} nearby sell orders for {self.get_type_name(type_id)}")
+            orders_by_type[type_id] = nearby_orders
+    
+    def _can_beat_jita(self, type_id: int, orders: List[Dict], jita_prices: Optional[Dict[int, float]]) -> bool:
+        """
+        Check whether any of a hull's orders could be a deal against its Jita price.
+        
+        Hulls whose cheapest order is above the Jita price cannot produce deals, so
+        their orders don't need system names resolved.
+        
+        Args:
+            type_id: The hull type ID
+            orders: The hull's sell orders
+            jita_prices: Lowest Jita price per type ID, or None to never skip
+            
+        Returns:
+            False if the hull can be skipped, True otherwise
+        """
+        if jita_prices is None or not orders:
+            return True
+        
+        jita_price = jita_prices.get(type_id, float('inf'))
+        return min(order.get('price', 0) for order in orders) <= jita_price
+    
+    def fetch_ship_orders(self, ship_type='battleship', jita_prices=None) -> Dict[int, List[Dict]]:
         """
         Fetch market orders for the specified ship type.
         
         This method will use EVERef market data if available, falling back to ESI API if not.
+        If Jita prices are given, hulls with no order at or below their Jita price are skipped.
         """
         logger.info(f"Fetching {ship_type} sell orders from regions around {self.reference_system_name}...")
         
         # Determine which ship type IDs to use
-        if ship_type == 'battleship':
-            type_ids = config.ALL_BATTLESHIP_TYPE_IDS
-        elif ship_type == 'cruiser':
-            type_ids = config.ALL_CRUISER_TYPE_IDS
-        elif ship_type == 'command_ship':
-            type_ids = config.ALL_COMMAND_SHIP_TYPE_IDS
-        else:
-            logger.warning(f"Unknown ship type: {ship_type}, defaulting to battleships")
-            type_ids = config.ALL_BATTLESHIP_TYPE_IDS
+        type_ids = self.get_type_ids(ship_type)
+        
+        # Resolve any type names not in the static hull data up front
+        self.prefetch_names(type_ids=type_ids)
         
         # Get the regions to search
-        search_region_ids = get_regions_to_search(config.SOLAR_SYSTEM_DATA_PATH, self.reference_system_id)
+        search_region_ids = get_regions_to_search(config.SOLAR_SYSTEM_DATA_PATH, self.reference_system_id, self.max_jumps)
         logger.info(f"Discovered {len(search_region_ids)} regions to search: {search_region_ids}")
         
-        orders_by_type = defaultdict(list)
+        orders_by_type = {}
         
         if self.use_everef and self.everef_client:
-            # Check if the EVERef data directory exists
-            data_dir = self.everef_client.data_dir
-            market_orders_dir = self.everef_client.market_orders_dir
-            
-            if os.path.exists(market_orders_dir) and any(f.endswith('_processed.csv') or f.endswith('.csv.bz2') for f in os.listdir(market_orders_dir)):
+            # Check if the processed EVERef market database exists
+            if self.everef_client.has_market_data():
                 # Use EVERef market data (faster)
                 logger.info("Using EVERef market data for faster retrieval")
                 
@@ -116,87 +359,25 @@ class EnhancedMarketScanner:
                     order_type='sell'
                 )
                 
-                # Process each type's orders
-                for type_id in type_ids:
-                    type_name = self.get_type_name(type_id)
-                    logger.info(f"Processing orders for {type_name} (Type ID: {type_id})")
-                    
-                    # Get orders for this type
-                    orders = all_orders_by_type.get(type_id, [])
-                    
-                    # Filter by minimum price
-                    filtered_orders = [
-                        order for order in orders
-                        if order.get('price', 0) >= config.MIN_PRICE
-                    ]
-                    
-                    # Add system names and distances
-                    for order in filtered_orders:
-                        system_id = order.get('system_id')
-                        if system_id:
-                            order['system_name'] = self.get_system_name(system_id)
-                            order['distance_to_reference'] = self.get_distance_to_reference(system_id)
-                    
-                    # Filter by distance
-                    nearby_orders = [
-                        order for order in filtered_orders
-                        if order.get('distance_to_reference', 999) <= config.MAX_JUMPS
-                    ]
-                    
-                    if nearby_orders:
-                        logger.info(f"Found {len(nearby_orders)} nearby sell orders for {type_name}")
-                        orders_by_type[type_id].extend(nearby_orders)
-                    else:
-                        logger.info(f"No nearby sell orders found for {type_name}")
+                # Keep each type's nearby orders, skipping hulls that cannot beat Jita
+                self._add_nearby_orders(type_ids, all_orders_by_type, orders_by_type, jita_prices)
             else:
                 # EVERef data not available, fall back to ESI API
                 logger.warning("EVERef market data not available. Please run everef_market_data_downloader.py to download market data.")
                 logger.info("Falling back to ESI API for market data retrieval")
-                self._fetch_orders_using_esi(search_region_ids, type_ids, orders_by_type)
+                self._fetch_orders_using_esi(search_region_ids, type_ids, orders_by_type, jita_prices)
         else:
             # Use ESI API (slower)
             logger.info("Using ESI API for market data retrieval")
-            self._fetch_orders_using_esi(search_region_ids, type_ids, orders_by_type)
+            self._fetch_orders_using_esi(search_region_ids, type_ids, orders_by_type, jita_prices)
         
         return orders_by_type
     
-    def _fetch_orders_using_esi(self, search_region_ids, type_ids, orders_by_type):
+    def _fetch_orders_using_esi(self, search_region_ids, type_ids, orders_by_type, jita_prices=None):
         """Fetch orders using the ESI API."""
-        for type_id in type_ids:
-            type_name = self.get_type_name(type_id)
-            logger.info(f"Fetching orders for {type_name} (Type ID: {type_id})")
-            
-            all_orders = []
-            for region_id in search_region_ids:
-                logger.debug(f"Searching region ID: {region_id}")
-                orders = self.esi_client.get_market_orders(
-                    region_id=region_id,
-                    type_id=type_id,
-                    order_type='sell'
-                )
-                all_orders.extend(orders)
-            
-            filtered_orders = [
-                order for order in all_orders
-                if order.get('price', 0) >= config.MIN_PRICE
-            ]
-            
-            for order in filtered_orders:
-                system_id = order.get('system_id')
-                if system_id:
-                    order['system_name'] = self.get_system_name(system_id)
-                    order['distance_to_reference'] = self.get_distance_to_reference(system_id)
-            
-            nearby_orders = [
-                order for order in filtered_orders
-                if order.get('distance_to_reference', 999) <= config.MAX_JUMPS
-            ]
-            
-            if nearby_orders:
-                logger.info(f"Found {len(nearby_orders)} nearby sell orders for {type_name}")
-                orders_by_type[type_id].extend(nearby_orders)
-            else:
-                logger.info(f"No nearby sell orders found for {type_name}")
+        # Whole region order books where that takes fewer requests, per-type requests otherwise
+        orders_for_type = self.esi_client.get_market_orders_by_type(search_region_ids, type_ids, order_type='sell')
+        self._add_nearby_orders(type_ids, orders_for_type, orders_by_type, jita_prices)
     
     def fetch_jita_prices(self, ship_type='battleship') -> Dict[int, float]:
         """
@@ -209,21 +390,11 @@ class EnhancedMarketScanner:
         lowest_prices = {}
         
         # Determine which ship type IDs to use
-        if ship_type == 'battleship':
-            type_ids = config.ALL_BATTLESHIP_TYPE_IDS
-        elif ship_type == 'cruiser':
-            type_ids = config.ALL_CRUISER_TYPE_IDS
-        elif ship_type == 'command_ship':
-            type_ids = config.ALL_COMMAND_SHIP_TYPE_IDS
-        else:
-            logger.warning(f"Unknown ship type: {ship_type}, defaulting to battleships")
-            type_ids = config.ALL_BATTLESHIP_TYPE_IDS
+        type_ids = self.get_type_ids(ship_type)
         
         if self.use_everef and self.everef_client:
-            # Check if the EVERef data directory exists
-            market_orders_dir = self.everef_client.market_orders_dir
-            
-            if os.path.exists(market_orders_dir) and any(f.endswith('_processed.csv') or f.endswith('.csv.bz2') for f in os.listdir(market_orders_dir)):
+            # Check if the processed EVERef market database exists
+            if self.everef_client.has_market_data():
                 # Use EVERef market data (faster)
                 logger.info("Using EVERef market data for faster Jita price retrieval")
                 
@@ -234,22 +405,9 @@ class EnhancedMarketScanner:
                     order_type='sell'
                 )
                 
-                # Filter for Jita orders and find lowest prices
-                for type_id in type_ids:
-                    type_name = self.get_type_name(type_id)
-                    
-                    # Filter orders for this type in Jita
-                    jita_orders = [
-                        order for order in all_orders
-                        if order.get('type_id') == type_id and order.get('system_id') == config.JITA_SYSTEM_ID
-                    ]
-                    
-                    if jita_orders:
-                        lowest_price = min(order.get('price', float('inf')) for order in jita_orders)
-                        lowest_prices[type_id] = lowest_price
-                        logger.info(f"Lowest Jita price for {type_name}: {lowest_price:,.2f} ISK")
-                    else:
-                        logger.info(f"No Jita sell orders found for {type_name}")
+                # Find the lowest Jita price of every type in one pass
+                lowest_prices.update(lowest_prices_in_system(all_orders, type_ids, config.JITA_SYSTEM_ID))
+                self._log_jita_prices(type_ids, lowest_prices)
             else:
                 # EVERef data not available, fall back to ESI API
                 logger.warning("EVERef market data not available. Please run everef_market_data_downloader.py to download market data.")
@@ -262,27 +420,60 @@ class EnhancedMarketScanner:
         
         return lowest_prices
     
+    def get_jita_prices(self, ship_type='battleship') -> Dict[int, float]:
+        """
+        Get Jita prices for the specified ship type, reusing recent results.
+        
+        Prices younger than config.JITA_PRICE_TTL_SECONDS are returned as-is. Older prices
+        are still returned immediately, while a background thread fetches fresh ones for
+        the next scan. Prices are only fetched synchronously the first time.
+        """
+        cache_key = (ship_type, tuple(self.get_type_ids(ship_type)))
+        
+        with self._jita_lock:
+            cached = self._jita_price_cache.get(cache_key)
+            if cached and time.monotonic() - cached[0] >= config.JITA_PRICE_TTL_SECONDS and cache_key not in self._jita_refreshing:
+                # Serve the stale prices and refresh them in the background
+                self._jita_refreshing.add(cache_key)
+                threading.Thread(target=self._refresh_jita_prices, args=(ship_type, cache_key), daemon=True).start()
+        
+        if cached:
+            return cached[1]
+        
+        prices = self.fetch_jita_prices(ship_type)
+        with self._jita_lock:
+            self._jita_price_cache[cache_key] = (time.monotonic(), prices)
+        return prices
+    
+    def _refresh_jita_prices(self, ship_type, cache_key):
+        """Fetch fresh Jita prices into the cache (runs in a background thread)."""
+        try:
+            prices = self.fetch_jita_prices(ship_type)
+            with self._jita_lock:
+                self._jita_price_cache[cache_key] = (time.monotonic(), prices)
+        except Exception as e:
+            logger.error(f"Error refreshing Jita prices for {ship_type}: {e}")
+        finally:
+            with self._jita_lock:
+                self._jita_refreshing.discard(cache_key)
+    
     def _fetch_jita_prices_using_esi(self, type_ids, lowest_prices):
         """Fetch Jita prices using the ESI API."""
+        # Fetch every hull's Forge orders in as few (concurrent) requests as possible
+        logger.info(f"Fetching Jita prices for {len(type_ids)} types")
+        forge_orders = self.esi_client.get_market_orders_by_type([config.FORGE_REGION_ID], type_ids, order_type='sell')
+        
+        lowest_prices.update(lowest_prices_in_system(
+            (order for orders in forge_orders.values() for order in orders), type_ids, config.JITA_SYSTEM_ID
+        ))
+        self._log_jita_prices(type_ids, lowest_prices)
+    
+    def _log_jita_prices(self, type_ids, lowest_prices):
+        """Log the lowest Jita price found for each type."""
         for type_id in type_ids:
             type_name = self.get_type_name(type_id)
-            logger.info(f"Fetching Jita prices for {type_name} (Type ID: {type_id})")
-            
-            orders = self.esi_client.get_market_orders(
-                region_id=config.FORGE_REGION_ID,
-                type_id=type_id,
-                order_type='sell'
-            )
-            
-            jita_orders = [
-                order for order in orders
-                if order.get('system_id') == config.JITA_SYSTEM_ID
-            ]
-            
-            if jita_orders:
-                lowest_price = min(order.get('price', float('inf')) for order in jita_orders)
-                lowest_prices[type_id] = lowest_price
-                logger.info(f"Lowest Jita price for {type_name}: {lowest_price:,.2f} ISK")
+            if type_id in lowest_prices:
+                logger.info(f"Lowest Jita price for {type_name}: {lowest_prices[type_id]:,.2f} ISK")
             else:
                 logger.info(f"No Jita sell orders found for {type_name}")
     
@@ -290,43 +481,65 @@ class EnhancedMarketScanner:
         """Find good deals on ship hulls near the reference system."""
         logger.info(f"Finding good deals on {ship_type} hulls near {self.reference_system_name}...")
         
-        ship_orders = self.fetch_ship_orders(ship_type)
-        jita_prices = self.fetch_jita_prices(ship_type)
+        # Look the distance table up again, in case the solar system data file changed
+        self._distance_table = None
         
-        good_deals = []
+        # Jita prices first, so hulls that cannot produce deals are skipped while fetching orders
+        jita_prices = self.get_jita_prices(ship_type)
+        ship_orders = self.fetch_ship_orders(ship_type, jita_prices)
         
-        for type_id, orders in ship_orders.items():
-            type_name = self.get_type_name(type_id)
+        # Flatten the orders into arrays so filtering and savings math run in numpy
+        flat_orders = [(type_id, order) for type_id, orders in ship_orders.items() for order in orders]
+        if not flat_orders:
+            return []
+        
+        prices = np.fromiter((order.get('price', 0) for _, order in flat_orders), dtype=np.float64, count=len(flat_orders))
+        jita = np.fromiter((jita_prices.get(type_id, float('inf')) for type_id, _ in flat_orders), dtype=np.float64, count=len(flat_orders))
+        
+        deal_indexes = np.flatnonzero(prices <= jita)
+        deal_jita = jita[deal_indexes]
+        savings = deal_jita - prices[deal_indexes]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            savings_percent = np.where(deal_jita > 0, savings / deal_jita * 100, 0)
+        
+        # Best deals first (stable, so equal percentages keep their scan order)
+        ranking = np.argsort(-savings_percent, kind='stable')
+        
+        # Resolve each hull's name once rather than once per deal
+        type_names = {type_id: self.get_type_name(type_id) for type_id in ship_orders}
+        
+        good_deals = []
+        log_deals = logger.isEnabledFor(logging.DEBUG)
+        for deal_index, deal_savings, deal_percent in zip(
+            deal_indexes[ranking].tolist(), savings[ranking].tolist(), savings_percent[ranking].tolist()
+        ):
+            type_id, order = flat_orders[deal_index]
+            type_name = type_names[type_id]
+            price = order.get('price', 0)
             jita_price = jita_prices.get(type_id, float('inf'))
+            system_name = order.get('system_name', 'Unknown')
+            distance = order.get('distance_to_reference', 999)
             
-            for order in orders:
-                price = order.get('price', 0)
-                system_name = order.get('system_name', 'Unknown')
-                distance = order.get('distance_to_reference', 999)
-                
-                if price <= jita_price:
-                    good_deal = {
-                        'type_id': type_id,
-                        'type_name': type_name,
-                        'price': price,
-                        'jita_price': jita_price,
-                        'savings': jita_price - price,
-                        'savings_percent': ((jita_price - price) / jita_price) * 100 if jita_price > 0 else 0,
-                        'system_id': order.get('system_id'),
-                        'system_name': system_name,
-                        'distance_to_reference': distance,
-                        'volume_remain': order.get('volume_remain', 0),
-                        'order_id': order.get('order_id')
-                    }
-                    good_deals.append(good_deal)
-                    logger.info(
-                        f"Found good deal: {type_name} in {system_name} "
-                        f"({distance} jumps from {self.reference_system_name}) for {price:,.2f} ISK "
-                        f"(Jita: {jita_price:,.2f} ISK, "
-                        f"Savings: {good_deal['savings']:,.2f} ISK, "
-                        f"{good_deal['savings_percent']:.2f}%)"
-                    )
-        
-        good_deals.sort(key=lambda deal: deal['savings_percent'], reverse=True)
+            good_deal = {
+                'type_id': type_id,
+                'type_name': type_name,
+                'price': price,
+                'jita_price': jita_price,
+                'savings': deal_savings,
+                'savings_percent': deal_percent,
+                'system_id': order.get('system_id'),
+                'system_name': system_name,
+                'distance_to_reference': distance,
+                'volume_remain': order.get('volume_remain', 0),
+                'order_id': order.get('order_id')
+            }
+            good_deals.append(good_deal)
+            if log_deals:
+                # Per-deal lines are debug output; callers log the deal count
+                logger.debug(
+                    "Found good deal: %s in %s (%s jumps from %s) for %s ISK (Jita: %s ISK, Savings: %s ISK, %.2f%%)",
+                    type_name, system_name, distance, self.reference_system_name,
+                    format(price, ',.2f'), format(jita_price, ',.2f'), format(deal_savings, ',.2f'), deal_percent
+                )
         
         return good_deals
\ No newline at end of file
@@ -3,9 +3,18 @@ EVE ESI API client for fetching market data.
 """
 import requests
 import logging
-from typing import Dict, List, Optional, Any, Union
+import orjson
+import os
+import pickle
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Any, Union, Tuple
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 import config
+from cache import get_cache
 
 # Set up logging
 logging.basicConfig(
@@ -14,6 +23,15 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Maximum number of IDs accepted by a single /universe/names/ request
+NAMES_BATCH_SIZE = 1000
+
+# Total size of the GET response bodies kept for conditional requests; the least recently used go first
+ETAG_CACHE_MAX_BYTES = 64 * 1024 * 1024
+
+# Response headers kept with a cached body, so a 304 can be answered completely from the cache
+CACHED_RESPONSE_HEADERS = ('X-Pages',)
+
 class ESIClient:
     """Client for interacting with the EVE Online ESI API."""
     
@@ -21,25 +39,135 @@ class ESIClient:
         """Initialize the ESI client."""
         self.session = requests.Session()
         self.session.headers.update({
-            'User-Agent': 'MarketBot/1.0 (github.com/alepmalagon/marketbot)'
+            'User-Agent': 'MarketBot/1.0 (github.com/alepmalagon/marketbot)',
+            'Accept-Encoding': 'gzip'
         })
+        
+        # Keep enough pooled keep-alive connections for the concurrent market order fetches,
+        # and retry transient gateway errors with backoff
+        adapter = HTTPAdapter(
+            pool_connections=config.ESI_MAX_WORKERS,
+            pool_maxsize=config.ESI_MAX_WORKERS,
+            max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=(502, 503, 504), raise_on_status=False)
+        )
+        self.session.mount('https://', adapter)
+        
+        # ETag, raw body and headers of recent GET responses, so unchanged data comes back as a
+        # cheap 304. Bounded by ETAG_CACHE_MAX_BYTES, shared by the fetch threads and saved to
+        # config.CACHE_DIR after each batch of market fetches so restarts benefit too.
+        self._etag_cache_path = os.path.join(config.CACHE_DIR, 'esi_etags.pickle')
+        self._etag_cache = self._load_etag_cache()
+        self._etag_cache_bytes = sum(len(entry[1]) for entry in self._etag_cache.values())
+        self._etag_cache_dirty = False
+        self._etag_lock = threading.Lock()
+    
+    def _load_etag_cache(self) -> OrderedDict:
+        """Load the ETag cache saved by a previous run, or start an empty one."""
+        try:
+            with open(self._etag_cache_path, 'rb') as f:
+                etag_cache = pickle.load(f)
+            logger.info(f"Loaded {len(etag_cache)} cached ESI responses from {self._etag_cache_path}")
+            return etag_cache
+        except FileNotFoundError:
+            return OrderedDict()
+        except Exception as e:
+            logger.warning(f"Could not load ESI response cache from {self._etag_cache_path}: {e}")
+            return OrderedDict()
+    
+    def save_etag_cache(self) -> None:
+        """Save the ETag cache to disk if it changed since it was loaded or last saved."""
+        with self._etag_lock:
+            if not self._etag_cache_dirty:
+                return
+            etag_cache = OrderedDict(self._etag_cache)
+            self._etag_cache_dirty = False
+        
+        try:
+            os.makedirs(config.CACHE_DIR, exist_ok=True)
+            # Write to a temporary file first so a crash never leaves a truncated file
+            tmp_path = f"{self._etag_cache_path}.tmp"
+            with open(tmp_path, 'wb') as f:
+                pickle.dump(etag_cache, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, self._etag_cache_path)
+        except OSError as e:
+            logger.warning(f"Could not save ESI response cache to {self._etag_cache_path}: {e}")
+    
+    def _get_cached_response(self, cache_key: tuple) -> Optional[tuple]:
+        """Get the cached (ETag, body, headers) entry for a request, marking it as recently used."""
+        with self._etag_lock:
+            cached = self._etag_cache.get(cache_key)
+            if cached is not None:
+                self._etag_cache.move_to_end(cache_key)
+            return cached
+    
+    def _cache_response(self, cache_key: tuple, entry: tuple) -> None:
+        """Store an (ETag, body, headers) entry for a request, forgetting the oldest once over the size limit."""
+        with self._etag_lock:
+            previous = self._etag_cache.pop(cache_key, None)
+            if previous is not None:
+                self._etag_cache_bytes -= len(previous[1])
+            self._etag_cache[cache_key] = entry
+            self._etag_cache_bytes += len(entry[1])
+            while self._etag_cache_bytes > ETAG_CACHE_MAX_BYTES and len(self._etag_cache) > 1:
+                _, evicted = self._etag_cache.popitem(last=False)
+                self._etag_cache_bytes -= len(evicted[1])
+            self._etag_cache_dirty = True
+    
+    def _conditional_get(self, url: str, params: Optional[Dict[str, Any]] = None) -> Tuple[Any, Dict[str, str]]:
+        """
+        GET a URL, revalidating a previously cached response with its ETag.
+        
+        The raw body is cached and decoded on every call, so each caller gets its own
+        objects and may modify them without touching the cache.
+        
+        Args:
+            url: The URL to request
+            params: Optional query parameters
+            
+        Returns:
+            Tuple of (decoded JSON body, cached response headers)
+            
+        Raises:
+            requests.exceptions.RequestException: If the request failed
+            ValueError: If the body is not valid JSON
+        """
+        cache_key = (url, tuple(sorted((params or {}).items())))
+        cached = self._get_cached_response(cache_key)
+        headers = {'If-None-Match': cached[0]} if cached else None
+        
+        response = self.session.get(url, params=params, headers=headers)
+        if response.status_code == 304 and cached:
+            _, content, response_headers = cached
+        else:
+            response.raise_for_status()
+            content = response.content
+            response_headers = {name: response.headers[name] for name in CACHED_RESPONSE_HEADERS if name in response.headers}
+            etag = response.headers.get('ETag')
+            if etag:
+                self._cache_response(cache_key, (etag, content, response_headers))
+        
+        return orjson.loads(content), response_headers
     
-    def _make_request(self, url: str, params: Optional[Dict[str, Any]] = None) -> Union[Dict, List, None]:
+    def _make_request(self, url: str, params: Optional[Dict[str, Any]] = None, method: str = 'GET', json_body: Any = None) -> Union[Dict, List, None]:
         """
         Make a request to the ESI API.
         
         Args:
             url: The URL to request
             params: Optional query parameters
+            method: HTTP method to use
+            json_body: Optional JSON request body
             
         Returns:
             The JSON response or None if the request failed
         """
         try:
-            response = self.session.get(url, params=params)
+            if method == 'GET':
+                return self._conditional_get(url, params)[0]
+            response = self.session.request(method, url, params=params, json=json_body)
             response.raise_for_status()
-            return response.json()
-        except requests.exceptions.RequestException as e:
+            return orjson.loads(response.content)
+        except (requests.exceptions.RequestException, ValueError) as e:
             logger.error(f"Error making request to {url}: {e}")
             return None
     
@@ -67,6 +195,145 @@ class ESIClient:
         response = self._make_request(url, params)
         return response if response else []
     
+    def _get_orders_page(self, region_id: int, order_type: str, page: int) -> Tuple[List[Dict], int]:
+        """
+        Get one page of a region's market orders.
+        
+        Args:
+            region_id: The region ID to get orders from
+            order_type: Order type to filter by ('buy', 'sell' or 'all')
+            page: The page number (starting at 1)
+            
+        Returns:
+            Tuple of (orders on the page, total number of pages); (empty list, 0) on failure
+        """
+        url = config.MARKET_ORDERS_ENDPOINT.format(region_id=region_id)
+        try:
+            orders, headers = self._conditional_get(url, {'order_type': order_type, 'page': page})
+            return orders, int(headers.get('X-Pages', 1))
+        except (requests.exceptions.RequestException, ValueError) as e:
+            logger.error(f"Error fetching page {page} of market orders for region {region_id}: {e}")
+            return [], 0
+    
+    def _submit_remaining_pages(self, executor: ThreadPoolExecutor, region_id: int, order_type: str, pages: int) -> List:
+        """Submit the requests for pages 2..pages of a region's market orders to an executor."""
+        return [executor.submit(self._get_orders_page, region_id, order_type, page) for page in range(2, pages + 1)]
+    
+    def _join_pages(self, region_id: int, page_results: List[Tuple[List[Dict], int]]) -> Optional[List[Dict]]:
+        """
+        Combine the fetched pages of a region's market orders.
+        
+        Args:
+            region_id: The region ID the pages belong to
+            page_results: (orders, page count) of every page, in page order
+            
+        Returns:
+            All the region's orders, or None if any page failed
+        """
+        orders = []
+        for page, (page_orders, page_count) in enumerate(page_results, start=1):
+            if page_count == 0:
+                # A partial order book would silently hide orders; let the caller fall back
+                logger.warning(f"Page {page} of market orders for region {region_id} failed, discarding the region's pages")
+                return None
+            orders.extend(page_orders)
+        return orders
+    
+    def get_region_orders(self, region_id: int, order_type: str = 'sell', max_pages: Optional[int] = None) -> Optional[List[Dict]]:
+        """
+        Get all market orders in a region, fetching the pages after the first concurrently.
+        
+        Args:
+            region_id: The region ID to get orders from
+            order_type: Order type to filter by ('buy', 'sell' or 'all')
+            max_pages: If given, give up (return None) when the region has more pages than this
+            
+        Returns:
+            A list of market orders, or None if any page failed or max_pages was exceeded
+        """
+        first_page = self._get_orders_page(region_id, order_type, 1)
+        pages = first_page[1]
+        if pages == 0 or (max_pages is not None and pages > max_pages):
+            return None
+        
+        with ThreadPoolExecutor(max_workers=config.ESI_MAX_WORKERS) as executor:
+            page_futures = self._submit_remaining_pages(executor, region_id, order_type, pages)
+            orders = self._join_pages(region_id, [first_page] + [future.result() for future in page_futures])
+        
+        if orders is not None:
+            logger.debug(f"Fetched {len(orders)} {order_type} orders from {pages} pages in region {region_id}")
+        return orders
+    
+    def get_market_orders_by_type(self, region_ids: List[int], type_ids: List[int], order_type: str = 'sell') -> Dict[int, List[Dict]]:
+        """
+        Get market orders for many types across many regions with as few requests as possible.
+        
+        Each region's complete order book is fetched and bucketed by type when it has no
+        more pages than there are types, since that takes fewer requests than asking for
+        each type separately. Larger regions (e.g. The Forge), and regions where a page
+        fails, are queried per type instead. All requests share one thread pool, so no
+        more than ESI_MAX_WORKERS are in flight at once.
+        
+        Args:
+            region_ids: The region IDs to get orders from
+            type_ids: The type IDs to get orders for
+            order_type: Order type to filter by ('buy' or 'sell')
+            
+        Returns:
+            Dictionary mapping each type ID to its orders across all regions
+        """
+        type_id_set = frozenset(type_ids)
+        orders_by_type = {type_id: [] for type_id in type_ids}
+        region_orders = {}
+        per_type_regions = []
+        type_futures = []
+        
+        def submit_per_type(region_id):
+            per_type_regions.append(region_id)
+            type_futures.extend(
+                (type_id, executor.submit(self.get_market_orders, region_id=region_id, type_id=type_id, order_type=order_type))
+                for type_id in type_ids
+            )
+        
+        with ThreadPoolExecutor(max_workers=config.ESI_MAX_WORKERS) as executor:
+            # The first page of every region tells how many pages its order book has
+            first_page_futures = {
+                region_id: executor.submit(self._get_orders_page, region_id, order_type, 1)
+                for region_id in region_ids
+            }
+            
+            # Queue the remaining pages of small regions; large (or failed) regions are queried per type
+            page_futures = {}
+            for region_id, future in first_page_futures.items():
+                pages = future.result()[1]
+                if pages == 0 or pages > len(type_ids):
+                    submit_per_type(region_id)
+                else:
+                    page_futures[region_id] = self._submit_remaining_pages(executor, region_id, order_type, pages)
+            
+            for region_id, futures in page_futures.items():
+                page_results = [first_page_futures[region_id].result()] + [future.result() for future in futures]
+                orders = self._join_pages(region_id, page_results)
+                if orders is None:
+                    submit_per_type(region_id)
+                else:
+                    region_orders[region_id] = orders
+        
+        for orders in region_orders.values():
+            for order in orders:
+                if order.get('type_id') in type_id_set:
+                    orders_by_type[order['type_id']].append(order)
+        
+        for type_id, future in type_futures:
+            orders_by_type[type_id].extend(future.result())
+        
+        self.save_etag_cache()
+        logger.info(
+            f"Fetched orders for {len(type_ids)} types from {len(region_ids)} regions "
+            f"({len(region_orders)} as full order books)"
+        )
+        return orders_by_type
+    
     def get_type_info(self, type_id: int) -> Dict:
         """
         Get information about a specific type.
@@ -95,6 +362,28 @@ class ESIClient:
         response = self._make_request(url)
         return response if response else {}
     
+    def get_names(self, ids: List[int]) -> Dict[int, str]:
+        """
+        Resolve the names of many IDs (types, systems, ...) with as few requests as possible.
+        
+        Uses the /universe/names/ endpoint, which accepts up to NAMES_BATCH_SIZE IDs
+        per request. IDs in a batch that fails to resolve are left out of the result.
+        
+        Args:
+            ids: The IDs to resolve
+            
+        Returns:
+            Dictionary mapping IDs to names
+        """
+        unique_ids = list(dict.fromkeys(int(i) for i in ids))
+        names = {}
+        for start in range(0, len(unique_ids), NAMES_BATCH_SIZE):
+            batch = unique_ids[start:start + NAMES_BATCH_SIZE]
+            response = self._make_request(config.UNIVERSE_NAMES_ENDPOINT, method='POST', json_body=batch)
+            for entry in response or []:
+                names[entry['id']] = entry['name']
+        return names
+    
     def get_route(self, origin: int, destination: int) -> List[int]:
         """
         Get the route between two systems.
@@ -124,4 +413,47 @@ class ESIClient:
         route = self.get_route(origin, destination)
         # The route includes both origin and destination, so the number of jumps is len(route) - 1
         # If the route is empty, return a large number to indicate that the systems are not connected
-        return len(route) - 1 if route else 999
\ No newline at end of file
+        return len(route) - 1 if route else 999
+
+# Shared ESI client, created on first use so its HTTP session is reused across scans
+_esi_client = None
+
+def get_esi_client() -> ESIClient:
+    """
+    Get the shared ESI client, creating it on first use.
+    
+    Returns:
+        The process-wide ESIClient instance
+    """
+    global _esi_client
+    if _esi_client is None:
+        _esi_client = ESIClient()
+    return _esi_client
+
+def get_system_name(system_id: int, esi_client: ESIClient = None) -> str:
+    """
+    Get the name of a system, using the shared on-disk cache before asking the ESI API.
+    
+    System names never change, so a name is only looked up once and then kept in
+    the 'system_names' cache, which the scanners use as well.
+    
+    Args:
+        system_id: The system ID to get the name for
+        esi_client: Optional ESI client to use (defaults to the shared client)
+        
+    Returns:
+        The system name, or a placeholder if it could not be resolved
+    """
+    system_id = int(system_id)
+    system_names = get_cache('system_names')
+    if system_id in system_names:
+        return system_names[system_id]
+    
+    esi_client = esi_client or get_esi_client()
+    system_name = esi_client.get_system_info(system_id).get('name')
+    if system_name is None:
+        # Don't persist failed lookups
+        return f'System {system_id}'
+    
+    system_names[system_id] = system_name
+    return system_name
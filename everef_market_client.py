@@ -52,6 +52,15 @@ class EVERefMarketClient:
             # raise FileNotFoundError(f"Database not found at {self.db_path}")
 
 
+    def has_market_data(self) -> bool:
+        """
+        Check whether the processed market orders database is available.
+
+        Returns:
+            True if the SQLite database populated by the downloader exists.
+        """
+        return os.path.exists(self.db_path)
+
     # Removed _get_latest_market_orders_file and _load_market_orders_from_file
     # Removed _filter_orders_by_region_and_type and _filter_sell_orders (handled by SQL)
 
@@ -8,15 +8,31 @@ It's designed to be run manually to create a local database of market data.
 """
 import os
 import sys
+import io
 import logging
 import argparse
+import queue
+import shutil
+import subprocess
+import tempfile
+import threading
 import requests
 import bz2
+import json
 import pandas as pd
 import sqlite3 # Added for SQLite functionality
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from typing import Optional, List, Dict, Any
 
+# Optional: ADBC lets us ingest Arrow data into SQLite without per-row Python binding
+try:
+    import pyarrow as pa
+    import adbc_driver_sqlite.dbapi as adbc_sqlite
+except ImportError:
+    pa = None
+    adbc_sqlite = None
+
 # Set up logging
 logging.basicConfig(
     level=logging.INFO,
@@ -24,6 +40,132 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Column dtypes for the market orders snapshot.
+# Plain numpy dtypes parse much faster than pandas' nullable extension types.
+# Columns that can be empty in the snapshot are read as float64 (NaN -> NULL in SQLite);
+# their INTEGER columns in MARKET_ORDERS_SCHEMA store the whole-number floats as integers.
+MARKET_ORDER_DTYPES = {
+    'order_id': 'int64',
+    'type_id': 'int32',
+    'location_id': 'int64',
+    'volume_total': 'int64',
+    'volume_remain': 'int64',
+    'min_volume': 'float64',        # May be empty
+    'price': 'float64',
+    'is_buy_order': 'bool',
+    'duration': 'float64',          # May be empty
+    # 'issued' will be parsed by parse_dates
+    # 'range' is left as a plain object column
+    'system_id': 'float64',         # May be empty
+    'region_id': 'int32'
+}
+
+# Explicit schema for the market orders table. There is deliberately no PRIMARY KEY so
+# the bulk insert does no per-row uniqueness checks; the unique index on order_id is
+# built in one pass after the data is loaded (see _create_indexes).
+MARKET_ORDERS_SCHEMA = """
+    CREATE TABLE market_orders (
+        order_id INTEGER,
+        type_id INTEGER,
+        location_id INTEGER,
+        volume_total INTEGER,
+        volume_remain INTEGER,
+        min_volume INTEGER,
+        price REAL,
+        is_buy_order INTEGER,
+        duration INTEGER,
+        issued TIMESTAMP,
+        range TEXT,
+        system_id INTEGER,
+        region_id INTEGER
+    )
+"""
+
+# The region and type IDs the market_orders table was filtered to when it was loaded (JSON
+# lists, NULL for no filter), so a load with a different filter is never taken as up to date
+LOAD_FILTER_SCHEMA = """
+    CREATE TABLE IF NOT EXISTS load_filter (
+        region_ids TEXT,
+        type_ids TEXT
+    )
+"""
+
+# Streaming download settings: size of each network read and how many
+# decompressed chunks may be buffered between the download and parse threads
+STREAM_CHUNK_SIZE = 1024 * 1024
+STREAM_QUEUE_SIZE = 64
+
+
+class _QueueReader(io.RawIOBase):
+    """Read-only binary file object over byte chunks delivered through a queue (None marks the end)."""
+
+    def __init__(self, chunks: queue.Queue):
+        self._chunks = chunks
+        self._buffer = memoryview(b'')
+        self._eof = False
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, b) -> int:
+        while not self._buffer and not self._eof:
+            chunk = self._chunks.get()
+            if chunk is None:
+                self._eof = True
+            else:
+                self._buffer = memoryview(chunk)
+
+        n = min(len(b), len(self._buffer))
+        b[:n] = self._buffer[:n]
+        self._buffer = self._buffer[n:]
+        return n
+
+
+class TeeReader:
+    """File-like wrapper that copies every chunk read from a source into a sink."""
+
+    def __init__(self, source, sink):
+        """
+        Initialize the tee.
+
+        Args:
+            source: Binary file-like object to read from
+            sink: Binary file-like object receiving a copy of everything read
+        """
+        self._source = source
+        self._sink = sink
+
+    def read(self, size: int = -1) -> bytes:
+        data = self._source.read(size)
+        if data:
+            self._sink.write(data)
+        return data
+
+
+def _put_chunk(chunks: queue.Queue, chunk: Optional[bytes], cancelled: threading.Event) -> bool:
+    """
+    Put a chunk on the queue, giving up if the consumer has been cancelled.
+
+    Returns:
+        True if the chunk was queued, False if the consumer went away
+    """
+    while not cancelled.is_set():
+        try:
+            chunks.put(chunk, timeout=1)
+            return True
+        except queue.Full:
+            continue
+    return False
+
+
+def _filter_columns(region_ids: Optional[List[int]], type_ids: Optional[List[int]]) -> tuple:
+    """Get the load_filter column values for a region/type filter (order-independent JSON, None for no filter)."""
+    return tuple(
+        json.dumps(sorted(int(i) for i in ids)) if ids is not None else None
+        for ids in (region_ids, type_ids)
+    )
+
+
 class EVERefMarketDataDownloader:
     """Downloader for EVERef market data snapshots."""
 
@@ -38,10 +180,31 @@ class EVERefMarketDataDownloader:
         self.data_dir = data_dir
         self.market_orders_dir = os.path.join(data_dir, "market_orders") # Added for clarity
         self.db_path = os.path.join(self.market_orders_dir, "market_orders.db") # Added SQLite DB path
+        self.snapshot_path = os.path.join(self.market_orders_dir, "market-orders-latest.v3.csv.bz2")
 
         # Create data directory if it doesn't exist
         os.makedirs(self.market_orders_dir, exist_ok=True) # Updated to use market_orders_dir
 
+    def _is_snapshot_fresh(self) -> bool:
+        """
+        Check whether we already have a snapshot that is less than 1 hour old.
+
+        Returns:
+            True if the cached snapshot can be reused
+        """
+        try:
+            file_stat = os.stat(self.snapshot_path)
+        except FileNotFoundError:
+            return False
+
+        file_age = datetime.now() - datetime.fromtimestamp(file_stat.st_mtime)
+        if file_age < timedelta(hours=1):
+            logger.info(f"Using cached market orders snapshot: {self.snapshot_path} (age: {file_age})")
+            return True
+
+        logger.info(f"Cached snapshot is {file_age} old, downloading fresh data")
+        return False
+
     def download_market_orders(self) -> Optional[str]:
         """
         Download the latest market orders snapshot.
@@ -52,27 +215,20 @@ class EVERefMarketDataDownloader:
         try:
             logger.info(f"Downloading market orders snapshot from {self.market_orders_url}")
 
-            # Extract filename from URL
-            filename = "market-orders-latest.v3.csv.bz2"
-            file_path = os.path.join(self.market_orders_dir, filename) # Updated path
-
-            # Check if we already have this snapshot and it's less than 1 hour old
-            if os.path.exists(file_path):
-                file_age = datetime.now() - datetime.fromtimestamp(os.path.getmtime(file_path))
-                if file_age < timedelta(hours=1):
-                    logger.info(f"Using cached market orders snapshot: {file_path} (age: {file_age})")
-                    return file_path
-                else:
-                    logger.info(f"Cached snapshot is {file_age} old, downloading fresh data")
+            file_path = self.snapshot_path
+            if self._is_snapshot_fresh():
+                return file_path
 
             # Download the snapshot
             response = requests.get(self.market_orders_url, stream=True)
             response.raise_for_status()
 
-            # Save the snapshot to the data directory
-            with open(file_path, 'wb') as f:
+            # Save the snapshot to the data directory (renamed into place once complete)
+            part_path = f"{file_path}.part"
+            with open(part_path, 'wb') as f:
                 for chunk in response.iter_content(chunk_size=8192):
                     f.write(chunk)
+            os.replace(part_path, file_path)
 
             logger.info(f"Downloaded market orders snapshot to {file_path}")
             return file_path
@@ -81,12 +237,105 @@ class EVERefMarketDataDownloader:
             logger.error(f"Error downloading market orders snapshot: {e}")
             return None
 
-    def process_and_load_to_db(self, file_path: str) -> bool:
+    def download_and_load_to_db(self, region_ids: Optional[List[int]] = None, type_ids: Optional[List[int]] = None) -> bool:
+        """
+        Download the latest snapshot and load it into the SQLite database in one pipelined pass.
+
+        A background thread streams the download to disk and through a bz2 decompressor while
+        the calling thread parses the decompressed CSV, so total time is roughly
+        max(download, decompress + parse) instead of their sum. If the cached snapshot is
+        still fresh, it is processed from disk instead.
+
+        Args:
+            region_ids: Optional list of region IDs to keep (all regions if None)
+            type_ids: Optional list of type IDs to keep (all types if None)
+
+        Returns:
+            True if downloading, processing and loading were successful, False otherwise.
+        """
+        if self._is_snapshot_fresh():
+            return self.process_and_load_to_db(self.snapshot_path, region_ids=region_ids, type_ids=type_ids)
+
+        try:
+            logger.info(f"Streaming market orders snapshot from {self.market_orders_url}")
+            response = requests.get(self.market_orders_url, stream=True)
+            response.raise_for_status()
+
+            chunks = queue.Queue(maxsize=STREAM_QUEUE_SIZE)
+            cancelled = threading.Event()
+            with ThreadPoolExecutor(max_workers=1) as executor:
+                producer = executor.submit(self._stream_snapshot, response, chunks, cancelled)
+                try:
+                    df = self._read_market_orders(io.BufferedReader(_QueueReader(chunks), STREAM_CHUNK_SIZE))
+                finally:
+                    # Unblock the producer if parsing stopped early
+                    cancelled.set()
+                # Re-raise any download error before trusting the parsed data
+                producer.result()
+
+            logger.info(f"Downloaded market orders snapshot to {self.snapshot_path}")
+            return self._load_orders_to_db(df, region_ids=region_ids, type_ids=type_ids)
+
+        except requests.exceptions.RequestException as e:
+            logger.error(f"Error downloading market orders snapshot: {e}")
+            return False
+        except pd.errors.EmptyDataError:
+            logger.error("Error processing market orders: the downloaded snapshot is empty or corrupted.")
+            return False
+        except Exception as e:
+            # Log the full traceback for better debugging
+            logger.exception(f"Error processing market orders snapshot: {e}")
+            return False
+
+    def _stream_snapshot(self, response: requests.Response, chunks: queue.Queue, cancelled: threading.Event) -> None:
+        """
+        Save the snapshot to disk while feeding its decompressed bytes to the parser.
+
+        The raw bytes are read once, through a TeeReader that writes them to the cache file,
+        so the snapshot is still available for the hourly cache check on the next run.
+
+        Args:
+            response: Streaming HTTP response for the snapshot
+            chunks: Queue receiving decompressed chunks (None is queued at the end)
+            cancelled: Event set by the consumer when it stops reading
+        """
+        decompressor = bz2.BZ2Decompressor()
+        part_path = f"{self.snapshot_path}.part"
+        try:
+            # Let urllib3 undo any transport Content-Encoding so we see the bz2 bytes
+            response.raw.decode_content = True
+            with open(part_path, 'wb') as f:
+                # Every compressed byte lands in the on-disk cache as it is decompressed
+                reader = TeeReader(response.raw, f)
+                while True:
+                    raw = reader.read(STREAM_CHUNK_SIZE)
+                    if not raw:
+                        break
+                    while raw:
+                        data = decompressor.decompress(raw)
+                        raw = b''
+                        if decompressor.eof:
+                            # Multi-stream bz2 file: continue with a fresh decompressor
+                            raw = decompressor.unused_data
+                            decompressor = bz2.BZ2Decompressor()
+                        if data and not _put_chunk(chunks, data, cancelled):
+                            return
+
+            # Only a complete download may serve as the cached snapshot for the next run
+            os.replace(part_path, self.snapshot_path)
+        finally:
+            if os.path.exists(part_path):
+                os.remove(part_path)
+            _put_chunk(chunks, None, cancelled)
+
+    def process_and_load_to_db(self, file_path: str, region_ids: Optional[List[int]] = None, type_ids: Optional[List[int]] = None) -> bool:
         """
         Process a market orders snapshot (CSV.bz2) and load it into the SQLite database.
 
         Args:
             file_path: Path to the downloaded snapshot file (csv.bz2)
+            region_ids: Optional list of region IDs to keep (all regions if None)
+            type_ids: Optional list of type IDs to keep (all types if None)
 
         Returns:
             True if processing and loading were successful, False otherwise.
@@ -95,70 +344,22 @@ class EVERefMarketDataDownloader:
             logger.info(f"Processing market orders snapshot from {file_path}")
 
             # Check if the database needs updating (source file is newer than DB)
-            if os.path.exists(self.db_path):
-                 source_mtime = os.path.getmtime(file_path)
-                 db_mtime = os.path.getmtime(self.db_path)
-                 if db_mtime >= source_mtime:
-                     logger.info(f"SQLite database {self.db_path} is already up-to-date.")
-                     return True
+            try:
+                db_stat = os.stat(self.db_path)
+            except FileNotFoundError:
+                db_stat = None
 
+            if db_stat is not None and db_stat.st_mtime >= os.stat(file_path).st_mtime:
+                if self._loaded_filter() == _filter_columns(region_ids, type_ids):
+                    logger.info(f"SQLite database {self.db_path} is already up-to-date.")
+                    return True
+                logger.info(f"SQLite database {self.db_path} was loaded with a different region/type filter, reloading")
 
             # Open the bz2 compressed CSV file
-            with bz2.open(file_path, 'rt', encoding='utf-8') as f:
-                # Read the CSV into a pandas DataFrame
-                logger.info("Reading bz2 compressed CSV file (this may take a moment)...")
-                # --- Corrected dtypes using pandas nullable types ---
-                dtypes = {
-                    'order_id': pd.Int64Dtype(),    # Use nullable Int64
-                    'type_id': pd.Int32Dtype(),     # Use nullable Int32
-                    'location_id': pd.Int64Dtype(), # Use nullable Int64
-                    'volume_total': pd.Int64Dtype(),# Use nullable Int64
-                    'volume_remain': pd.Int64Dtype(),# Use nullable Int64
-                    'min_volume': pd.Int32Dtype(),  # Use nullable Int32
-                    'price': 'float64',             # Float can handle NaN
-                    'is_buy_order': 'boolean',      # Pandas boolean handles NA
-                    'duration': pd.Int32Dtype(),    # Use nullable Int32 (Fixes the error)
-                    # 'issued' will be parsed by parse_dates
-                    'range': 'string',              # Pandas string handles NA
-                    'system_id': pd.Int32Dtype(),   # Use nullable Int32
-                    'region_id': pd.Int32Dtype()    # Use nullable Int32
-                 }
-                df = pd.read_csv(f, dtype=dtypes, parse_dates=['issued'])
-                # ----------------------------------------------------
-
-            logger.info(f"Loaded {len(df)} market orders from snapshot")
-
-            # --- Load data into SQLite Database ---
-            logger.info(f"Connecting to SQLite database: {self.db_path}")
-            conn = None # Initialize conn to None
-            try:
-                conn = sqlite3.connect(self.db_path)
-                logger.info(f"Writing {len(df)} records to 'market_orders' table (replacing existing)...")
-                # Pandas NA values will be correctly written as NULL to SQLite
-                df.to_sql('market_orders', conn, if_exists='replace', index=False, chunksize=100000)
-                logger.info("Data successfully written to 'market_orders' table.")
-
-                # --- Add Indexes for faster queries ---
-                logger.info("Creating indexes on 'market_orders' table...")
-                cursor = conn.cursor()
-                cursor.execute("CREATE INDEX IF NOT EXISTS idx_region_type_buy ON market_orders (region_id, type_id, is_buy_order)")
-                cursor.execute("CREATE INDEX IF NOT EXISTS idx_type_system ON market_orders (type_id, system_id)")
-                cursor.execute("CREATE INDEX IF NOT EXISTS idx_location_id ON market_orders (location_id)")
-                conn.commit()
-                logger.info("Indexes created successfully.")
-
-                return True
-
-            except sqlite3.Error as e:
-                 logger.error(f"SQLite error during data loading or index creation: {e}")
-                 if conn:
-                     conn.rollback() # Rollback changes on error
-                 return False
-            finally:
-                 if conn:
-                     conn.close()
-                     logger.info("SQLite database connection closed.")
-            # --- End SQLite ---
+            with bz2.open(file_path, 'rb') as f:
+                df = self._read_market_orders(f)
+
+            return self._load_orders_to_db(df, region_ids=region_ids, type_ids=type_ids)
 
         except pd.errors.EmptyDataError:
             logger.error(f"Error processing market orders: The file {file_path} is empty or corrupted.")
@@ -168,6 +369,257 @@ class EVERefMarketDataDownloader:
             logger.exception(f"Error processing market orders snapshot: {e}")
             return False
 
+    def _read_market_orders(self, f) -> pd.DataFrame:
+        """
+        Read the decompressed market orders CSV into a DataFrame.
+
+        Args:
+            f: Binary file object yielding the decompressed CSV
+
+        Returns:
+            DataFrame of market orders
+        """
+        # Read the CSV into a pandas DataFrame
+        logger.info("Reading bz2 compressed CSV file (this may take a moment)...")
+        df = pd.read_csv(f, dtype=MARKET_ORDER_DTYPES, parse_dates=['issued'])
+        logger.info(f"Loaded {len(df)} market orders from snapshot")
+        return df
+
+    def _load_orders_to_db(self, df: pd.DataFrame, region_ids: Optional[List[int]] = None, type_ids: Optional[List[int]] = None) -> bool:
+        """
+        Write market orders into the SQLite database, replacing the existing table.
+
+        Args:
+            df: DataFrame of market orders
+            region_ids: Optional list of region IDs to keep (all regions if None)
+            type_ids: Optional list of type IDs to keep (all types if None)
+
+        Returns:
+            True if loading was successful, False otherwise.
+        """
+        # Drop rows outside the regions/types we actually query before inserting
+        if region_ids is not None or type_ids is not None:
+            mask = pd.Series(True, index=df.index)
+            if region_ids is not None:
+                mask &= df['region_id'].isin(region_ids)
+            if type_ids is not None:
+                mask &= df['type_id'].isin(type_ids)
+            df = df[mask]
+            logger.info(f"Kept {len(df)} market orders after region/type filtering")
+
+        # --- Load data into SQLite Database ---
+        logger.info(f"Connecting to SQLite database: {self.db_path}")
+        conn = None # Initialize conn to None
+        try:
+            logger.info(f"Writing {len(df)} records to 'market_orders' table (replacing existing)...")
+            conn = sqlite3.connect(self.db_path)
+            # Recreate the table from our schema so the insert below only appends rows
+            cursor = conn.cursor()
+            # Forget the previous filter first, so an interrupted load never looks up to date
+            cursor.execute("DROP TABLE IF EXISTS load_filter")
+            cursor.execute("DROP TABLE IF EXISTS market_orders")
+            cursor.execute(MARKET_ORDERS_SCHEMA)
+            conn.commit()
+
+            if adbc_sqlite is not None:
+                self._ingest_with_adbc(df)
+            else:
+                # NaN values are written as NULL to SQLite
+                df.to_sql('market_orders', conn, if_exists='append', index=False, chunksize=100000)
+            logger.info("Data successfully written to 'market_orders' table.")
+
+            self._record_filter(conn, region_ids, type_ids)
+            self._create_indexes(conn)
+            return True
+
+        except sqlite3.Error as e:
+             logger.error(f"SQLite error during data loading or index creation: {e}")
+             if conn:
+                 conn.rollback() # Rollback changes on error
+             return False
+        finally:
+             if conn:
+                 conn.close()
+                 logger.info("SQLite database connection closed.")
+        # --- End SQLite ---
+
+    def _record_filter(self, conn: sqlite3.Connection, region_ids: Optional[List[int]], type_ids: Optional[List[int]]) -> None:
+        """
+        Record the region/type filter the 'market_orders' table was just loaded with.
+
+        Args:
+            conn: Open connection to the market orders database (committed by the caller)
+            region_ids: Region IDs kept by the load (None if all regions)
+            type_ids: Type IDs kept by the load (None if all types)
+        """
+        cursor = conn.cursor()
+        cursor.execute(LOAD_FILTER_SCHEMA)
+        cursor.execute("DELETE FROM load_filter")
+        cursor.execute("INSERT INTO load_filter (region_ids, type_ids) VALUES (?, ?)", _filter_columns(region_ids, type_ids))
+
+    def _loaded_filter(self) -> Optional[tuple]:
+        """
+        Get the region/type filter the database was last loaded with.
+
+        Returns:
+            Tuple of (region IDs JSON, type IDs JSON) as stored by _record_filter, or None if
+            the database has no record (e.g. it predates the load_filter table)
+        """
+        try:
+            conn = sqlite3.connect(self.db_path)
+            try:
+                return conn.execute("SELECT region_ids, type_ids FROM load_filter").fetchone()
+            finally:
+                conn.close()
+        except sqlite3.Error:
+            return None
+
+    def _create_indexes(self, conn: sqlite3.Connection) -> None:
+        """
+        Create the query indexes on the 'market_orders' table and commit.
+
+        Args:
+            conn: Open connection to the market orders database
+        """
+        # --- Add Indexes for faster queries ---
+        logger.info("Creating indexes on 'market_orders' table...")
+        cursor = conn.cursor()
+        cursor.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_order_id ON market_orders (order_id)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_region_type_buy ON market_orders (region_id, type_id, is_buy_order)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_type_system ON market_orders (type_id, system_id)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_location_id ON market_orders (location_id)")
+        conn.commit()
+        logger.info("Indexes created successfully.")
+
+    def load_with_sqlite_import(self, file_path: str, region_ids: Optional[List[int]] = None, type_ids: Optional[List[int]] = None) -> bool:
+        """
+        Load a market orders snapshot using the sqlite3 command-line shell's CSV import.
+
+        The snapshot is decompressed to a temporary CSV which the sqlite3 shell imports
+        into a staging table in C; the typed 'market_orders' table is then built with a
+        single INSERT ... SELECT, so no rows pass through Python. Falls back to
+        process_and_load_to_db if the sqlite3 shell is not installed.
+
+        Args:
+            file_path: Path to the downloaded snapshot file (csv.bz2)
+            region_ids: Optional list of region IDs to keep (all regions if None)
+            type_ids: Optional list of type IDs to keep (all types if None)
+
+        Returns:
+            True if processing and loading were successful, False otherwise.
+        """
+        sqlite3_cli = shutil.which('sqlite3')
+        if sqlite3_cli is None:
+            logger.warning("sqlite3 command-line shell not found, falling back to pandas loading")
+            return self.process_and_load_to_db(file_path, region_ids=region_ids, type_ids=type_ids)
+
+        csv_path = None
+        conn = None
+        try:
+            # Decompress the snapshot to a temporary CSV next to the database
+            logger.info(f"Decompressing {file_path} for sqlite3 import...")
+            with tempfile.NamedTemporaryFile('wb', suffix='.csv', dir=self.market_orders_dir, delete=False) as tmp:
+                csv_path = tmp.name
+                with bz2.open(file_path, 'rb') as src:
+                    shutil.copyfileobj(src, tmp, STREAM_CHUNK_SIZE)
+
+            # Import into an untyped staging table (column names come from the CSV header), forgetting
+            # the previous filter first so an interrupted load never looks up to date
+            logger.info("Importing CSV into staging table with the sqlite3 shell...")
+            script = (
+                "DROP TABLE IF EXISTS load_filter;\n"
+                "DROP TABLE IF EXISTS market_orders_staging;\n"
+                ".mode csv\n"
+                f'.import "{csv_path}" market_orders_staging\n'
+            )
+            subprocess.run([sqlite3_cli, self.db_path], input=script, text=True, check=True, capture_output=True)
+
+            # Build the typed table from the staging table
+            conditions = []
+            params = []
+            if region_ids is not None:
+                conditions.append(f"CAST(region_id AS INTEGER) IN ({', '.join('?' * len(region_ids))})")
+                params.extend(region_ids)
+            if type_ids is not None:
+                conditions.append(f"CAST(type_id AS INTEGER) IN ({', '.join('?' * len(type_ids))})")
+                params.extend(type_ids)
+            where = f" WHERE {' AND '.join(conditions)}" if conditions else ""
+
+            conn = sqlite3.connect(self.db_path)
+            cursor = conn.cursor()
+            cursor.execute("DROP TABLE IF EXISTS market_orders")
+            cursor.execute(f"""
+                CREATE TABLE market_orders AS SELECT
+                    CAST(order_id AS INTEGER) AS order_id,
+                    CAST(type_id AS INTEGER) AS type_id,
+                    CAST(location_id AS INTEGER) AS location_id,
+                    CAST(volume_total AS INTEGER) AS volume_total,
+                    CAST(volume_remain AS INTEGER) AS volume_remain,
+                    CAST(NULLIF(min_volume, '') AS INTEGER) AS min_volume,
+                    CAST(price AS REAL) AS price,
+                    CASE WHEN lower(is_buy_order) IN ('true', '1') THEN 1 ELSE 0 END AS is_buy_order,
+                    CAST(NULLIF(duration, '') AS INTEGER) AS duration,
+                    issued,
+                    range,
+                    CAST(NULLIF(system_id, '') AS INTEGER) AS system_id,
+                    CAST(region_id AS INTEGER) AS region_id
+                FROM market_orders_staging{where}
+            """, params)
+            cursor.execute("DROP TABLE market_orders_staging")
+            conn.commit()
+            logger.info("Data successfully written to 'market_orders' table.")
+
+            self._record_filter(conn, region_ids, type_ids)
+            self._create_indexes(conn)
+            return True
+
+        except subprocess.CalledProcessError as e:
+            logger.error(f"sqlite3 import failed: {e.stderr}")
+            return False
+        except (OSError, sqlite3.Error) as e:
+            logger.error(f"Error loading market orders with sqlite3 import: {e}")
+            if conn:
+                conn.rollback()
+            return False
+        finally:
+            if conn:
+                conn.close()
+            if csv_path and os.path.exists(csv_path):
+                os.remove(csv_path)
+
+    def _ingest_with_adbc(self, df: pd.DataFrame) -> None:
+        """
+        Bulk-append a DataFrame to the 'market_orders' table using the ADBC SQLite driver.
+
+        The frame is converted to an Arrow table once and bound column-wise by the driver,
+        skipping the per-row tuple construction done by pandas' to_sql.
+
+        Args:
+            df: DataFrame of market orders to write
+        """
+        logger.info("Using ADBC to ingest market orders into SQLite")
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        with adbc_sqlite.connect(self.db_path) as adbc_conn:
+            with adbc_conn.cursor() as cursor:
+                cursor.adbc_ingest('market_orders', table, mode='append')
+            adbc_conn.commit()
+
+
+def get_configured_filters():
+    """
+    Get the region and type IDs the scanners query, based on the configuration.
+
+    Returns:
+        Tuple of (region IDs, type IDs)
+    """
+    import config
+    from solar_system_data import get_regions_to_search
+
+    region_ids = set(get_regions_to_search(config.SOLAR_SYSTEM_DATA_PATH, config.REFERENCE_SYSTEM_ID))
+    region_ids.add(config.FORGE_REGION_ID)  # Needed for Jita reference prices
+    type_ids = set(config.ALL_BATTLESHIP_TYPE_IDS + config.ALL_CRUISER_TYPE_IDS + config.ALL_COMMAND_SHIP_TYPE_IDS)
+    return sorted(region_ids), sorted(type_ids)
+
 
 def main():
     """Parse command line arguments and run the downloader."""
@@ -181,26 +633,44 @@ def main():
         help="Directory to store downloaded market data and database (default: everef_data)"
     )
 
+    parser.add_argument(
+        "--only-configured",
+        action="store_true",
+        help="Only load orders for the configured hull types in the regions around the reference system and The Forge"
+    )
+
+    parser.add_argument(
+        "--sqlite-import",
+        action="store_true",
+        help="Load the snapshot with the sqlite3 command-line shell's CSV import instead of pandas"
+    )
+
     # Parse arguments
     args = parser.parse_args()
 
     # Create the downloader
     downloader = EVERefMarketDataDownloader(data_dir=args.data_dir)
 
-    # Download market orders
-    logger.info("Downloading market orders data...")
-    orders_file_bz2 = downloader.download_market_orders()
-
-    if orders_file_bz2:
-        # Process and load data into SQLite
-        logger.info(f"Processing {orders_file_bz2} and loading into SQLite...")
-        success = downloader.process_and_load_to_db(orders_file_bz2)
-        if success:
-            logger.info(f"Market orders data successfully processed and loaded into: {downloader.db_path}")
-        else:
-            logger.error("Failed to process market orders data and load into SQLite.")
+    region_ids = None
+    type_ids = None
+    if args.only_configured:
+        region_ids, type_ids = get_configured_filters()
+        logger.info(f"Restricting load to {len(region_ids)} regions and {len(type_ids)} hull types")
+
+    if args.sqlite_import:
+        # Download market orders, then bulk-import them with the sqlite3 shell
+        logger.info("Downloading market orders data...")
+        orders_file_bz2 = downloader.download_market_orders()
+        success = bool(orders_file_bz2) and downloader.load_with_sqlite_import(orders_file_bz2, region_ids=region_ids, type_ids=type_ids)
+    else:
+        # Download market orders and load them into SQLite (download and parsing overlap)
+        logger.info("Downloading market orders data and loading into SQLite...")
+        success = downloader.download_and_load_to_db(region_ids=region_ids, type_ids=type_ids)
+
+    if success:
+        logger.info(f"Market orders data successfully processed and loaded into: {downloader.db_path}")
     else:
-        logger.error("Failed to download market orders data.")
+        logger.error("Failed to download market orders data and load into SQLite.")
 
     logger.info("EVERef Market Data Downloader script completed.")
 
@@ -9,17 +9,16 @@ This script can run the bot in different modes:
 """
 import argparse
 import logging
-import json
-import os
 import platform
 import sys
 from datetime import datetime
 
+import orjson
+
 from enhanced_market_scanner import EnhancedMarketScanner
-from service_manager import ServiceManager, run_as_daemon, run_in_foreground
 import config
-from esi_client import ESIClient
-from solar_system_data import load_solar_systems
+from esi_client import get_system_name, get_esi_client
+from solar_system_data import get_system_id_by_name
 
 # Set up logging
 logging.basicConfig(
@@ -28,6 +27,20 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Whether we are running on Windows (checked once at import)
+IS_WINDOWS = platform.system() == "Windows"
+
+# Row template for the deals table printed by run_single_scan
+DEAL_ROW_FORMAT = (
+    "{type_name:<15} "
+    "{system_name:<10} "
+    "{distance_to_reference:<6} "
+    "{price:<19,.2f} "
+    "{jita_price:<19,.2f} "
+    "{savings:<19,.2f} "
+    "{savings_percent:<9.2f}%"
+)
+
 def find_system_id_by_name(system_name: str) -> int:
     """
     Find a system ID by its name using the solar system data.
@@ -38,24 +51,7 @@ def find_system_id_by_name(system_name: str) -> int:
     Returns:
         The system ID if found, or None if not found
     """
-    logger.info(f"Looking up system ID for name: {system_name}")
-    
-    # Load solar system data
-    solar_systems = load_solar_systems(config.SOLAR_SYSTEM_DATA_PATH)
-    
-    if not solar_systems:
-        logger.warning("No solar system data available, cannot look up system by name")
-        return None
-    
-    # Search for the system by name (case-insensitive)
-    system_name_lower = system_name.lower()
-    for system_id, system_data in solar_systems.items():
-        if system_data['solar_system_name'].lower() == system_name_lower:
-            logger.info(f"Found system ID {system_id} for name {system_name}")
-            return system_id
-    
-    logger.warning(f"No system found with name: {system_name}")
-    return None
+    return get_system_id_by_name(system_name, config.SOLAR_SYSTEM_DATA_PATH)
 
 def resolve_reference_system(system_input):
     """
@@ -70,12 +66,12 @@ def resolve_reference_system(system_input):
     if system_input is None:
         return None
     
-    # Check if the input is already a numeric ID
-    if isinstance(system_input, int) or (isinstance(system_input, str) and system_input.isdigit()):
+    # Numeric input (an int or a string of digits) is already a system ID
+    try:
         return int(system_input)
-    
-    # Otherwise, treat it as a system name and look up the ID
-    return find_system_id_by_name(system_input)
+    except (TypeError, ValueError):
+        # Otherwise, treat it as a system name and look up the ID
+        return find_system_id_by_name(system_input)
 
 def parse_hull_ids(hull_ids_str):
     """
@@ -99,7 +95,7 @@ def parse_hull_ids(hull_ids_str):
         logger.error(f"Invalid hull IDs format: {hull_ids_str}. Expected comma-separated integers.")
         return None
 
-def run_single_scan(reference_system=None, max_jumps=None, hull_ids=None):
+def run_single_scan(reference_system=None, max_jumps=None, hull_ids=None, esi_client=None):
     """
     Run a single market scan and output the results.
     
@@ -107,7 +103,10 @@ def run_single_scan(reference_system=None, max_jumps=None, hull_ids=None):
         reference_system: Optional system ID or name to use as reference
         max_jumps: Optional maximum number of jumps from reference system
         hull_ids: Optional list of hull type IDs to search for
+        esi_client: Optional ESI client to reuse (defaults to the shared client)
     """
+    esi_client = esi_client or get_esi_client()
+    
     # Resolve the reference system (could be ID or name)
     reference_system_id = resolve_reference_system(reference_system)
     
@@ -119,10 +118,8 @@ def run_single_scan(reference_system=None, max_jumps=None, hull_ids=None):
     # If a reference system ID is provided, update the config
     if reference_system_id:
         config.REFERENCE_SYSTEM_ID = reference_system_id
-        # Get the system name from the ESI API
-        esi_client = ESIClient()
-        system_info = esi_client.get_system_info(reference_system_id)
-        config.REFERENCE_SYSTEM_NAME = system_info.get('name', f'System {reference_system_id}')
+        # Get the system name (cached on disk, ESI API on first lookup)
+        config.REFERENCE_SYSTEM_NAME = get_system_name(reference_system_id, esi_client)
     
     # If max_jumps is provided, update the config
     if max_jumps is not None:
@@ -142,7 +139,8 @@ def run_single_scan(reference_system=None, max_jumps=None, hull_ids=None):
     scanner = EnhancedMarketScanner(
         reference_system_id=config.REFERENCE_SYSTEM_ID,
         reference_system_name=config.REFERENCE_SYSTEM_NAME,
-        use_everef=True  # Use EVERef market data for faster retrieval
+        use_everef=True,  # Use EVERef market data for faster retrieval
+        esi_client=esi_client
     )
     
     # Find good deals
@@ -152,28 +150,22 @@ def run_single_scan(reference_system=None, max_jumps=None, hull_ids=None):
     if good_deals:
         logger.info(f"Found {len(good_deals)} good deals!")
         
-        # Print the deals in a table format
-        print(f"\n=== GOOD DEALS ON T1 BATTLESHIP HULLS NEAR {config.REFERENCE_SYSTEM_NAME.upper()} ===")
-        print(f"{'Type Name':<15} {'System':<10} {'Jumps':<6} {'Price (ISK)':<20} {'Jita Price':<20} {'Savings':<20} {'Savings %':<10}")
-        print("-" * 115)
-
-        for deal in good_deals:
-            print(
-                f"{deal['type_name']:<15} "
-                f"{deal['system_name']:<10} "
-                f"{deal['distance_to_reference']:<6} "
-                f"{deal['price']:<19,.2f} "
-                f"{deal['jita_price']:<19,.2f} "
-                f"{deal['savings']:<19,.2f} "
-                f"{deal['savings_percent']:<9.2f}%"
-            )
+        # Print the deals in a table format, written to stdout in one go
+        lines = [
+            f"\n=== GOOD DEALS ON T1 BATTLESHIP HULLS NEAR {config.REFERENCE_SYSTEM_NAME.upper()} ===",
+            f"{'Type Name':<15} {'System':<10} {'Jumps':<6} {'Price (ISK)':<20} {'Jita Price':<20} {'Savings':<20} {'Savings %':<10}",
+            "-" * 115,
+        ]
+        lines.extend(DEAL_ROW_FORMAT.format_map(deal) for deal in good_deals)
+        sys.stdout.write("\n".join(lines) + "\n")
 
-        # Save the deals to a JSON file
+        # Save the deals to an NDJSON file
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        filename = f"deals_{config.REFERENCE_SYSTEM_NAME.lower()}_{timestamp}.json"
+        filename = f"deals_{config.REFERENCE_SYSTEM_NAME.lower()}_{timestamp}.ndjson"
         
-        with open(filename, 'w') as f:
-            json.dump(good_deals, f, indent=2)
+        with open(filename, 'wb') as f:
+            # NDJSON: one compact deal per line, so readers can stream it
+            f.writelines(orjson.dumps(deal, option=orjson.OPT_APPEND_NEWLINE) for deal in good_deals)
         
         logger.info(f"Saved deals to {filename}")
     else:
@@ -183,7 +175,7 @@ def run_single_scan(reference_system=None, max_jumps=None, hull_ids=None):
 
 def install_windows_service():
     """Install the bot as a Windows service."""
-    if platform.system() != "Windows":
+    if not IS_WINDOWS:
         logger.error("Windows service installation is only available on Windows.")
         return
     
@@ -250,16 +242,19 @@ def main():
     
     # Run in the appropriate mode
     if args.mode == "scan":
-        run_single_scan(args.system, args.jumps, hull_ids)
+        run_single_scan(args.system, args.jumps, hull_ids, esi_client=get_esi_client())
     elif args.mode == "foreground":
+        # Service modes pull in the notification stack; only import them when needed
+        from service_manager import run_in_foreground
         logger.info("Starting in foreground service mode...")
         run_in_foreground(args.system, args.jumps, hull_ids)
     elif args.mode == "background":
-        if platform.system() == "Windows":
+        if IS_WINDOWS:
             logger.error("Background daemon mode is not supported on Windows.")
             logger.error("Please use --mode=windows-service instead.")
             return
         
+        from service_manager import run_as_daemon
         logger.info("Starting in background service mode...")
         run_as_daemon(args.system, args.jumps, hull_ids)
     elif args.mode == "windows-service":
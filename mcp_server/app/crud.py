@@ -11,14 +11,7 @@ async def get_type_info(db: aiosqlite.Connection, type_id: int) -> Optional[sche
         return schemas.EveTypeDetail(**row) # Unpack row into Pydantic model
     return None
 
-async def search_market_orders(
-    db: aiosqlite.Connection,
-    type_id: int,
-    region_id: Optional[int] = None,
-    system_id: Optional[int] = None,
-    order_type: Optional[str] = None,
-    limit: int = 100
-) -> List[schemas.MarketOrder]:
+def _build_market_orders_query(by_region: bool, by_system: bool, order_type: Optional[str]) -> str:
     query = """
         SELECT order_id, type_id, location_id, system_id, region_id,
                volume_total, volume_remain, min_volume, price,
@@ -26,14 +19,10 @@ async def search_market_orders(
         FROM market_orders
         WHERE type_id = :type_id
     """
-    params = {"type_id": type_id, "limit": limit}
-
-    if region_id is not None:
+    if by_region:
         query += " AND region_id = :region_id"
-        params["region_id"] = region_id
-    if system_id is not None:
+    if by_system:
         query += " AND system_id = :system_id"
-        params["system_id"] = system_id
     if order_type == "buy":
         query += " AND is_buy_order = 1" # Assuming 1 for True
     elif order_type == "sell":
@@ -42,9 +31,35 @@ async def search_market_orders(
     query += " ORDER BY price "
     query += "ASC " if order_type == "sell" else "DESC " # Sell orders: lowest price first; Buy orders: highest price first
     query += " LIMIT :limit"
+    return query
+
+# Every query shape, built once so each request reuses the same SQL text (and SQLite's cached statement)
+SQL_VARIANTS = {
+    (by_region, by_system, order_type): _build_market_orders_query(by_region, by_system, order_type)
+    for by_region in (False, True)
+    for by_system in (False, True)
+    for order_type in ("buy", "sell", None)
+}
+
+async def search_market_orders(
+    db: aiosqlite.Connection,
+    type_id: int,
+    region_id: Optional[int] = None,
+    system_id: Optional[int] = None,
+    order_type: Optional[str] = None,
+    limit: int = 100
+) -> List[schemas.MarketOrder]:
+    params = {"type_id": type_id, "region_id": region_id, "system_id": system_id, "limit": limit}
+    query = SQL_VARIANTS[(region_id is not None, system_id is not None, order_type)]
 
     cursor = await db.execute(query, params)
     rows = await cursor.fetchall()
     await cursor.close()
-    # Convert list of row objects to list of Pydantic models
-    return [schemas.MarketOrder(**row) for row in rows]
\ No newline at end of file
+    # Rows already have the right types, so build the models without re-validating every field;
+    # only the 0/1 buy flag needs converting
+    orders = []
+    for row in rows:
+        fields = dict(row)
+        fields["is_buy_order"] = bool(fields["is_buy_order"])
+        orders.append(schemas.MarketOrder.model_construct(**fields))
+    return orders
@@ -1,21 +1,38 @@
 # app/db.py
 import aiosqlite
 import os
+from fastapi import Request
 
 # Get DB path relative to the main app file or use environment variable
 DATABASE_URL = os.getenv("DATABASE_URL", "../data/eve_data.sqlite") # Adjust path as needed
 
+# Read-mostly tuning: WAL so readers never block each other, and a large page cache + mmap
+# so hot pages are served from memory
+PRAGMAS = """
+    PRAGMA journal_mode=WAL;
+    PRAGMA synchronous=NORMAL;
+    PRAGMA mmap_size=1073741824;
+    PRAGMA cache_size=-200000;
+    PRAGMA temp_store=MEMORY;
+"""
+
 async def get_db_connection():
-    # Use check_same_thread=False carefully if multiple threads access FastAPI
-    # But with async, it's generally better handled.
-    db = await aiosqlite.connect(DATABASE_URL)
+    # Keep plenty of prepared statements around for the shared connection
+    db = await aiosqlite.connect(DATABASE_URL, cached_statements=256)
     db.row_factory = aiosqlite.Row # Return rows that act like dicts
+    await db.executescript(PRAGMAS)
     return db
 
+# Called from the app lifespan: one long-lived connection shared by every request
+async def open_db(app):
+    app.state.db = await get_db_connection()
+
+async def close_db(app):
+    db = getattr(app.state, "db", None)
+    if db is not None:
+        await db.close()
+        app.state.db = None
+
 # Dependency for FastAPI endpoints
-async def get_db():
-    db = await get_db_connection()
-    try:
-        yield db
-    finally:
-        await db.close()
\ No newline at end of file
+async def get_db(request: Request):
+    yield request.app.state.db
@@ -1,11 +1,23 @@
 # app/main.py
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, Depends, HTTPException, Query
+from fastapi.responses import Response
+import orjson
 import aiosqlite
 from typing import List, Optional
 
 from . import crud, schemas, db # Relative imports
 
-app = FastAPI(title="EVE Online MCP Server (SQLite)")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Open the shared database connection once instead of per request
+    await db.open_db(app)
+    try:
+        yield
+    finally:
+        await db.close_db(app)
+
+app = FastAPI(title="EVE Online MCP Server (SQLite)", lifespan=lifespan)
 
 # --- MCP Endpoints ---
 
@@ -74,7 +86,12 @@ async def read_market_orders(
         order_type=order_type,
         limit=limit
     )
-    return orders
+    # The orders were built from typed rows, so skip FastAPI's response_model re-validation
+    # (response_model still documents the shape)
+    return Response(
+        content=orjson.dumps([order.__dict__ for order in orders]),
+        media_type="application/json"
+    )
 
 # Optional: Add root endpoint for basic check
 @app.get("/", tags=["Root"])
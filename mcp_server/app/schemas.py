@@ -1,5 +1,5 @@
 # app/schemas.py
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 from typing import List, Optional
 
 # --- MCP Discovery Schema ---
@@ -18,6 +18,8 @@ class EveTypeDetail(BaseModel):
     # Add more fields from invTypes as needed
 
 class MarketOrder(BaseModel):
+    model_config = ConfigDict(from_attributes=True) # To allow creating from ORM objects/db rows
+
     order_id: int
     type_id: int
     location_id: int
@@ -30,7 +32,4 @@ class MarketOrder(BaseModel):
     is_buy_order: bool
     duration: int
     issued: str # Consider using datetime
-    range: str
-
-    class Config:
-        orm_mode = True # To allow creating from ORM objects/db rows
\ No newline at end of file
+    range: str
\ No newline at end of file
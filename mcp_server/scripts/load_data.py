@@ -1,7 +1,14 @@
+import bz2
+import csv
 import sqlite3
-import pandas as pd
+from contextlib import contextmanager
+from itertools import islice
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pyarrow.types as pat
 import requests # or httpx
 import os
+import re
 import logging
 
 logging.basicConfig(level=logging.INFO)
@@ -13,7 +20,9 @@ os.makedirs(DOWNLOAD_DIR, exist_ok=True)
 
 # --- URLs for EveRef Data ---
 # Replace with actual, current URLs from docs.everef.net
-MARKET_ORDERS_URL = "https://data.everef.net/market-orders/market-orders-latest.parquet.bz2" # Example
+# Parquet is already compressed column by column, so fetch it as-is rather than a .bz2 wrapper
+# that would need a full decompression pass before it can be read
+MARKET_ORDERS_URL = "https://data.everef.net/market-orders/market-orders-latest.parquet" # Example
 INV_TYPES_URL = "https://data.everef.net/sde/invTypes.csv.bz2" # Example
 
 def download_file(url, target_path):
@@ -26,42 +35,102 @@ def download_file(url, target_path):
             f.write(chunk)
     logging.info("Download complete.")
 
-def load_parquet_to_sqlite(parquet_path, table_name, conn):
+def sqlite_type_for(arrow_type):
+    if pat.is_integer(arrow_type) or pat.is_boolean(arrow_type):
+        return "INTEGER"
+    if pat.is_floating(arrow_type) or pat.is_decimal(arrow_type):
+        return "REAL"
+    return "TEXT"
+
+@contextmanager
+def bulk_load(conn, table_name, column_defs):
+    # Recreate the table and fill it in one transaction, with no journal or fsyncs during the load
+    conn.execute("PRAGMA synchronous=OFF;")
+    conn.execute("PRAGMA journal_mode=OFF;")
+    try:
+        conn.execute(f'DROP TABLE IF EXISTS "{table_name}";')
+        conn.execute(f'CREATE TABLE "{table_name}" ({column_defs});')
+        conn.execute("BEGIN;")
+        yield
+        conn.execute("COMMIT;")
+    except Exception:
+        if conn.in_transaction:
+            conn.execute("ROLLBACK;")
+        raise
+    finally:
+        conn.execute("PRAGMA journal_mode=DELETE;")
+        conn.execute("PRAGMA synchronous=FULL;")
+
+def clean_column_name(name):
+    return re.sub('[^A-Za-z0-9_]+', '', name)
+
+def load_parquet_to_sqlite(parquet_path, table_name, conn, batch_size=100_000):
     logging.info(f"Loading {parquet_path} into table '{table_name}'...")
-    df = pd.read_parquet(parquet_path)
+    # Stream record batches instead of materialising the whole file as a DataFrame
+    if parquet_path.endswith('.bz2'):
+        # Parquet needs random access, so decompress into memory rather than to a second file on disk
+        with bz2.open(parquet_path, 'rb') as f:
+            parquet_file = pq.ParquetFile(pa.BufferReader(f.read()))
+    else:
+        parquet_file = pq.ParquetFile(parquet_path)
+    schema = parquet_file.schema_arrow
     # Optional: Clean column names if needed (e.g., remove spaces, special chars)
-    df.columns = df.columns.str.replace('[^A-Za-z0-9_]+', '', regex=True)
-    df.to_sql(table_name, conn, if_exists='replace', index=False)
-    logging.info(f"Table '{table_name}' created/replaced.")
+    columns = [clean_column_name(name) for name in schema.names]
+    column_defs = ", ".join(f'"{name}" {sqlite_type_for(field.type)}' for name, field in zip(columns, schema))
+    placeholders = ", ".join("?" for _ in columns)
+
+    rows_loaded = 0
+    with bulk_load(conn, table_name, column_defs):
+        for batch in parquet_file.iter_batches(batch_size=batch_size):
+            # Column-wise to Python lists, then zip into row tuples for executemany
+            rows = zip(*(column.to_pylist() for column in batch.columns))
+            conn.executemany(f'INSERT INTO "{table_name}" VALUES ({placeholders})', rows)
+            rows_loaded += batch.num_rows
+    logging.info(f"Table '{table_name}' created/replaced with {rows_loaded} rows.")
 
-def load_csv_to_sqlite(csv_path, table_name, conn, compression='bz2'):
+def load_csv_to_sqlite(csv_path, table_name, conn, compression='bz2', batch_size=50_000):
     logging.info(f"Loading {csv_path} into table '{table_name}'...")
-    # Adjust chunksize based on available memory
-    chunk_iter = pd.read_csv(csv_path, compression=compression, chunksize=50000)
-    first_chunk = True
-    for chunk in chunk_iter:
-         # Optional: Clean column names
-        chunk.columns = chunk.columns.str.replace('[^A-Za-z0-9_]+', '', regex=True)
-        write_mode = 'replace' if first_chunk else 'append'
-        chunk.to_sql(table_name, conn, if_exists=write_mode, index=False)
-        first_chunk = False
-    logging.info(f"Table '{table_name}' created/replaced.")
+    opener = bz2.open if compression == 'bz2' else open
+    with opener(csv_path, 'rt', encoding='utf-8', newline='') as f:
+        reader = csv.reader(f)
+        columns = [clean_column_name(name) for name in next(reader)]
+        # NUMERIC affinity stores number-like fields as INTEGER/REAL and the rest as TEXT,
+        # the same types pandas used to infer
+        column_defs = ", ".join(f'"{name}" NUMERIC' for name in columns)
+        placeholders = ", ".join("?" for _ in columns)
+
+        rows_loaded = 0
+        with bulk_load(conn, table_name, column_defs):
+            while True:
+                # Empty fields become NULL, as they did with pandas
+                rows = [[value if value != '' else None for value in row] for row in islice(reader, batch_size)]
+                if not rows:
+                    break
+                conn.executemany(f'INSERT INTO "{table_name}" VALUES ({placeholders})', rows)
+                rows_loaded += len(rows)
+    logging.info(f"Table '{table_name}' created/replaced with {rows_loaded} rows.")
 
 
 def create_indexes(conn):
     cursor = conn.cursor()
     logging.info("Creating indexes...")
     # Example Indexes (adjust table/column names based on actual data)
-    cursor.execute("CREATE INDEX IF NOT EXISTS idx_market_orders_type_region ON market_orders (type_id, region_id);")
-    cursor.execute("CREATE INDEX IF NOT EXISTS idx_market_orders_type_system ON market_orders (type_id, system_id);")
+    # Match search_market_orders: equality on type + region/system + side, then ORDER BY price,
+    # so SQLite walks the index in price order and stops at LIMIT instead of sorting
+    cursor.execute("DROP INDEX IF EXISTS idx_market_orders_type_region;")
+    cursor.execute("DROP INDEX IF EXISTS idx_market_orders_type_system;")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_mo_tri_price ON market_orders (type_id, region_id, is_buy_order, price);")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_mo_tsi_price ON market_orders (type_id, system_id, is_buy_order, price);")
     cursor.execute("CREATE INDEX IF NOT EXISTS idx_invTypes_typeID ON invTypes (typeID);")
     # Add more indexes as needed
+    # Refresh planner statistics so the new indexes are picked up
+    cursor.execute("ANALYZE;")
     conn.commit()
     logging.info("Indexes created.")
 
 if __name__ == "__main__":
     # 1. Download Files
-    market_orders_file = os.path.join(DOWNLOAD_DIR, "market-orders-latest.parquet.bz2")
+    market_orders_file = os.path.join(DOWNLOAD_DIR, "market-orders-latest.parquet")
     inv_types_file = os.path.join(DOWNLOAD_DIR, "invTypes.csv.bz2")
     # download_file(MARKET_ORDERS_URL, market_orders_file) # Uncomment to run download
     # download_file(INV_TYPES_URL, inv_types_file) # Uncomment to run download
@@ -73,10 +142,8 @@ if __name__ == "__main__":
     try:
         # Note: Adjust paths if files are not compressed or are parquet
         load_csv_to_sqlite(inv_types_file, "invTypes", conn, compression='bz2')
-        # For parquet:
-        # import pyarrow # or fastparquet - ensure installed
-        # market_orders_parquet = os.path.join(DOWNLOAD_DIR, "market-orders-latest.parquet") # Assuming decompressed
-        # load_parquet_to_sqlite(market_orders_parquet, "market_orders", conn)
+        # For parquet (read straight from the download; .bz2 files are also accepted):
+        # load_parquet_to_sqlite(market_orders_file, "market_orders", conn)
 
         # 4. Create Indexes
         create_indexes(conn)
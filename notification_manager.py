@@ -4,6 +4,9 @@ Notification manager for the EVE Online Market Bot.
 import logging
 import os
 import platform
+import subprocess
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List
 
 from plyer import notification
@@ -17,6 +20,12 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# How many already-notified deals to remember; the oldest are forgotten first
+SENT_NOTIFICATIONS_LIMIT = 10_000
+
+# Notifications are delivered on worker threads so the scan never waits on them
+NOTIFICATION_WORKERS = 4
+
 class NotificationManager:
     """Manager for sending system notifications about good deals."""
     
@@ -25,7 +34,8 @@ class NotificationManager:
         self.enabled = config.ENABLE_NOTIFICATIONS
         self.min_savings_percent = config.MIN_SAVINGS_PERCENT_FOR_NOTIFICATION
         self.max_notifications = config.MAX_NOTIFICATIONS
-        self.sent_notifications = set()  # Keep track of notifications we've already sent
+        self.sent_notifications = OrderedDict()  # Deals we've already notified about, oldest first
+        self._executor = ThreadPoolExecutor(max_workers=NOTIFICATION_WORKERS, thread_name_prefix="notify")
     
     def send_deal_notifications(self, deals: List[Dict]) -> None:
         """
@@ -42,14 +52,16 @@ class NotificationManager:
             logger.info("No deals to notify about.")
             return
         
-        # Filter deals by minimum savings percentage
+        # Filter deals by minimum savings percentage and drop ones we've already notified about,
+        # before doing any formatting
         notable_deals = [
             deal for deal in deals 
             if deal.get('savings_percent', 0) >= self.min_savings_percent
+            and self._deal_key(deal) not in self.sent_notifications
         ]
         
         if not notable_deals:
-            logger.info(f"No deals with savings percentage >= {self.min_savings_percent}%")
+            logger.info(f"No new deals with savings percentage >= {self.min_savings_percent}%")
             return
         
         # Limit the number of notifications
@@ -57,31 +69,41 @@ class NotificationManager:
         
         # Send a notification for each deal
         for deal in notable_deals:
-            # Create a unique identifier for this deal
-            deal_id = f"{deal['type_id']}_{deal['system_id']}_{deal['price']}"
-            
-            # Skip if we've already notified about this deal
-            if deal_id in self.sent_notifications:
+            deal_key = self._deal_key(deal)
+            if deal_key in self.sent_notifications:
+                # The same order listed twice in this batch
                 continue
-            
-            # Add to sent notifications
-            self.sent_notifications.add(deal_id)
+            self._remember(deal_key)
             
             # Format the notification
             title = f"EVE Market Deal: {deal['type_name']}"
             message = (
-                f"Location: {deal['system_name']} ({deal['distance_to_sosala']} jumps from Sosala)\n"
+                f"Location: {deal['system_name']} ({deal['distance_to_reference']} jumps from {config.REFERENCE_SYSTEM_NAME})\n"
                 f"Price: {deal['price']:,.2f} ISK\n"
                 f"Jita Price: {deal['jita_price']:,.2f} ISK\n"
                 f"Savings: {deal['savings']:,.2f} ISK ({deal['savings_percent']:.2f}%)"
             )
             
-            try:
-                # Send the notification
-                self._send_notification(title, message)
-                logger.info(f"Sent notification for {deal['type_name']} in {deal['system_name']}")
-            except Exception as e:
-                logger.error(f"Failed to send notification: {e}")
+            self._executor.submit(self._deliver_notification, title, message, deal['type_name'], deal['system_name'])
+    
+    def _deliver_notification(self, title: str, message: str, type_name: str, system_name: str) -> None:
+        """Send one deal notification and log the outcome (runs on a worker thread)."""
+        try:
+            self._send_notification(title, message)
+            logger.info(f"Sent notification for {type_name} in {system_name}")
+        except Exception as e:
+            logger.error(f"Failed to send notification: {e}")
+    
+    @staticmethod
+    def _deal_key(deal: Dict) -> tuple:
+        """Get the key identifying a deal for duplicate detection."""
+        return (deal['type_id'], deal['system_id'], deal['price'])
+    
+    def _remember(self, deal_key: tuple) -> None:
+        """Record a notified deal, forgetting the oldest once the limit is reached."""
+        self.sent_notifications[deal_key] = None
+        while len(self.sent_notifications) > SENT_NOTIFICATIONS_LIMIT:
+            self.sent_notifications.popitem(last=False)
     
     def _send_notification(self, title: str, message: str) -> None:
         """
@@ -101,22 +123,35 @@ class NotificationManager:
         except Exception as e:
             logger.error(f"Error sending notification: {e}")
             
-            # Fallback for some platforms where plyer might not work
+            # Fallback for some platforms where plyer might not work. Title and message are
+            # passed as separate arguments (or environment variables), never through a shell.
             if platform.system() == "Windows":
                 try:
                     # Windows-specific fallback using PowerShell
-                    os.system(f'powershell -command "New-BurntToastNotification -Text \'{title}\', \'{message}\'"')
+                    subprocess.run(
+                        ['powershell', '-NoProfile', '-Command',
+                         'New-BurntToastNotification -Text $env:MARKETBOT_TITLE, $env:MARKETBOT_MESSAGE'],
+                        env={**os.environ, 'MARKETBOT_TITLE': title, 'MARKETBOT_MESSAGE': message},
+                        check=False
+                    )
                 except Exception as e2:
                     logger.error(f"Windows fallback notification failed: {e2}")
             elif platform.system() == "Darwin":  # macOS
                 try:
                     # macOS-specific fallback
-                    os.system(f'osascript -e \'display notification "{message}" with title "{title}"\'')
+                    subprocess.run(
+                        ['osascript',
+                         '-e', 'on run argv',
+                         '-e', 'display notification (item 2 of argv) with title (item 1 of argv)',
+                         '-e', 'end run',
+                         title, message],
+                        check=False
+                    )
                 except Exception as e2:
                     logger.error(f"macOS fallback notification failed: {e2}")
             elif platform.system() == "Linux":
                 try:
                     # Linux-specific fallback
-                    os.system(f'notify-send "{title}" "{message}"')
+                    subprocess.run(['notify-send', title, message], check=False)
                 except Exception as e2:
-                    logger.error(f"Linux fallback notification failed: {e2}")
\ No newline at end of file
+                    logger.error(f"Linux fallback notification failed: {e2}")
@@ -7,15 +7,17 @@ import signal
 import sys
 import time
 from datetime import datetime
-import json
+import orjson
 import threading
-import schedule
+from concurrent.futures import ThreadPoolExecutor
 
 from enhanced_market_scanner import EnhancedMarketScanner
 from notification_manager import NotificationManager
 import config
-from esi_client import ESIClient
-from solar_system_data import load_solar_systems
+from esi_client import ESIClient, get_system_name
+from solar_system_data import get_system_id_by_name
+from cache import flush_caches
+from deals_file import write_deals_file
 
 # Set up logging
 logging.basicConfig(
@@ -41,12 +43,12 @@ def resolve_reference_system(system_input):
     if system_input is None:
         return None
     
-    # Check if the input is already a numeric ID
-    if isinstance(system_input, int) or (isinstance(system_input, str) and system_input.isdigit()):
+    # Numeric input (an int or a string of digits) is already a system ID
+    try:
         return int(system_input)
-    
-    # Otherwise, treat it as a system name and look up the ID
-    return find_system_id_by_name(system_input)
+    except (TypeError, ValueError):
+        # Otherwise, treat it as a system name and look up the ID
+        return find_system_id_by_name(system_input)
 
 def find_system_id_by_name(system_name: str) -> int:
     """
@@ -58,24 +60,7 @@ def find_system_id_by_name(system_name: str) -> int:
     Returns:
         The system ID if found, or None if not found
     """
-    logger.info(f"Looking up system ID for name: {system_name}")
-    
-    # Load solar system data
-    solar_systems = load_solar_systems(config.SOLAR_SYSTEM_DATA_PATH)
-    
-    if not solar_systems:
-        logger.warning("No solar system data available, cannot look up system by name")
-        return None
-    
-    # Search for the system by name (case-insensitive)
-    system_name_lower = system_name.lower()
-    for system_id, system_data in solar_systems.items():
-        if system_data['solar_system_name'].lower() == system_name_lower:
-            logger.info(f"Found system ID {system_id} for name {system_name}")
-            return system_id
-    
-    logger.warning(f"No system found with name: {system_name}")
-    return None
+    return get_system_id_by_name(system_name, config.SOLAR_SYSTEM_DATA_PATH)
 
 class ServiceManager:
     """Manager for running the market bot as a background service."""
@@ -89,6 +74,9 @@ class ServiceManager:
             max_jumps: Optional maximum number of jumps from reference system
             hull_ids: Optional list of hull type IDs to search for
         """
+        # One ESI client (and HTTP session) shared by the setup lookups and the scanner
+        self.esi_client = ESIClient()
+        
         # Resolve the reference system (could be ID or name)
         reference_system_id = resolve_reference_system(reference_system)
         
@@ -99,10 +87,8 @@ class ServiceManager:
         # If a reference system ID is provided, update the config
         if reference_system_id:
             config.REFERENCE_SYSTEM_ID = reference_system_id
-            # Get the system name from the ESI API
-            esi_client = ESIClient()
-            system_info = esi_client.get_system_info(reference_system_id)
-            config.REFERENCE_SYSTEM_NAME = system_info.get('name', f'System {reference_system_id}')
+            # Get the system name (cached on disk, ESI API on first lookup)
+            config.REFERENCE_SYSTEM_NAME = get_system_name(reference_system_id, self.esi_client)
         
         # If max_jumps is provided, update the config
         if max_jumps is not None:
@@ -119,11 +105,14 @@ class ServiceManager:
         self.scanner = EnhancedMarketScanner(
             reference_system_id=config.REFERENCE_SYSTEM_ID,
             reference_system_name=config.REFERENCE_SYSTEM_NAME,
-            use_everef=True  # Use EVERef market data for faster retrieval
+            use_everef=True,  # Use EVERef market data for faster retrieval
+            esi_client=self.esi_client
         )
         self.notification_manager = NotificationManager()
         self.running = False
         self.stop_event = threading.Event()
+        # Deal files are written here so disk writes never hold up the scan loop
+        self._io_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="deals-io")
     
     def scan_for_deals(self):
         """Run a single scan for good deals."""
@@ -137,14 +126,13 @@ class ServiceManager:
             if good_deals:
                 logger.info(f"Found {len(good_deals)} good deals!")
                 
-                # Save the deals to a JSON file
+                # Save the deals to an NDJSON file
                 timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                filename = f"deals_{config.REFERENCE_SYSTEM_NAME.lower()}_{timestamp}.json"
-                
-                with open(filename, 'w') as f:
-                    json.dump(good_deals, f, indent=2)
+                filename = f"deals_{config.REFERENCE_SYSTEM_NAME.lower()}_{timestamp}.ndjson"
                 
-                logger.info(f"Saved deals to {filename}")
+                # NDJSON: one compact deal per line, so readers can stream it
+                payload = b''.join(orjson.dumps(deal, option=orjson.OPT_APPEND_NEWLINE) for deal in good_deals)
+                self._io_pool.submit(write_deals_file, filename, payload)
                 
                 # Send notifications
                 self.notification_manager.send_deal_notifications(good_deals)
@@ -167,8 +155,8 @@ class ServiceManager:
         # Run an initial scan
         self.scan_for_deals()
         
-        # Schedule regular scans
-        schedule.every(config.CHECK_INTERVAL_HOURS).hours.do(self.scan_for_deals)
+        interval = config.CHECK_INTERVAL_HOURS * 3600
+        next_run = time.monotonic() + interval
         
         logger.info(f"Service scheduled to run every {config.CHECK_INTERVAL_HOURS} hours.")
         
@@ -176,11 +164,16 @@ class ServiceManager:
         signal.signal(signal.SIGINT, self._signal_handler)
         signal.signal(signal.SIGTERM, self._signal_handler)
         
-        # Main loop
+        # Main loop: sleep until the next scan is due, waking early only when stopped
         try:
-            while self.running and not self.stop_event.is_set():
-                schedule.run_pending()
-                time.sleep(1)
+            while self.running:
+                if self.stop_event.wait(timeout=max(0, next_run - time.monotonic())):
+                    break
+                self.scan_for_deals()
+                next_run += interval
+                if next_run < time.monotonic():
+                    # A scan overran the interval; don't run the missed scans back to back
+                    next_run = time.monotonic() + interval
         except Exception as e:
             logger.error(f"Error in main service loop: {e}", exc_info=True)
         finally:
@@ -195,16 +188,18 @@ class ServiceManager:
         self.running = False
         self.stop_event.set()
         
-        # Clear the schedule
-        schedule.clear()
+        # Finish pending deal file writes, and make sure names and distances learned
+        # during this run are on disk
+        self._io_pool.shutdown(wait=True)
+        flush_caches()
         
         logger.info("Service stopped.")
     
     def _signal_handler(self, signum, frame):
         """Handle termination signals."""
         logger.info(f"Received signal {signum}. Shutting down...")
+        # The main loop is waiting on stop_event, so it returns as soon as stop() sets it
         self.stop()
-        sys.exit(0)
 
 
 def run_as_daemon(reference_system=None, max_jumps=None, hull_ids=None):
@@ -220,8 +215,8 @@ def run_as_daemon(reference_system=None, max_jumps=None, hull_ids=None):
         # Create a child process
         pid = os.fork()
         if pid > 0:
-            # Exit the parent process
-            sys.exit(0)
+            # Exit the parent process (without running exit handlers meant for the daemon)
+            os._exit(0)
     except OSError as e:
         logger.error(f"Fork failed: {e}")
         sys.exit(1)
@@ -236,7 +231,7 @@ def run_as_daemon(reference_system=None, max_jumps=None, hull_ids=None):
         pid = os.fork()
         if pid > 0:
             # Exit from the second parent
-            sys.exit(0)
+            os._exit(0)
     except OSError as e:
         logger.error(f"Second fork failed: {e}")
         sys.exit(1)
@@ -245,16 +240,21 @@ def run_as_daemon(reference_system=None, max_jumps=None, hull_ids=None):
     sys.stdout.flush()
     sys.stderr.flush()
     
-    with open('/dev/null', 'r') as f:
-        os.dup2(f.fileno(), sys.stdin.fileno())
-    
-    with open('marketbot.log', 'a+') as f:
-        os.dup2(f.fileno(), sys.stdout.fileno())
-        os.dup2(f.fileno(), sys.stderr.fileno())
+    # Plain file descriptors are enough here; no Python file objects or buffers needed
+    devnull_fd = os.open(os.devnull, os.O_RDONLY)
+    log_fd = os.open('marketbot.log', os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+    os.dup2(devnull_fd, sys.stdin.fileno())
+    os.dup2(log_fd, sys.stdout.fileno())
+    os.dup2(log_fd, sys.stderr.fileno())
+    os.close(devnull_fd)
+    os.close(log_fd)
     
     # Write the PID file
-    with open('marketbot.pid', 'w') as f:
-        f.write(str(os.getpid()))
+    pid_fd = os.open('marketbot.pid', os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        os.write(pid_fd, str(os.getpid()).encode())
+    finally:
+        os.close(pid_fd)
     
     # Start the service
     service = ServiceManager(reference_system, max_jumps, hull_ids)
@@ -7,9 +7,9 @@ and update the configuration with the latest ship type IDs.
 import logging
 import json
 import os
+import time
 from typing import Dict, List, Optional, Set
 
-from everef_client import EVERefClient
 import config
 
 # Set up logging
@@ -76,8 +76,13 @@ def load_ship_data_from_everef() -> Dict[str, Dict[str, List[Dict]]]:
     """
     logger.info("Loading ship data from EVERef API...")
     
-    # Check if cache file exists and is recent
-    if os.path.exists(SHIP_DATA_CACHE_FILE):
+    # Use the cache file if it exists and is recent
+    try:
+        cache_age = time.time() - os.path.getmtime(SHIP_DATA_CACHE_FILE)
+    except OSError:
+        cache_age = None
+    
+    if cache_age is not None and cache_age < config.SHIP_DATA_CACHE_TTL_HOURS * 3600:
         try:
             with open(SHIP_DATA_CACHE_FILE, 'r') as f:
                 cache_data = json.load(f)
@@ -86,8 +91,12 @@ def load_ship_data_from_everef() -> Dict[str, Dict[str, List[Dict]]]:
         except (json.JSONDecodeError, IOError) as e:
             logger.warning(f"Error loading cache file: {e}")
     
-    # Initialize EVERef client
-    client = EVERefClient()
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug(
+            "Preparing %d ships across %d subcategories",
+            sum(len(names) for subcategories in SHIP_CATEGORIES.values() for names in subcategories.values()),
+            sum(len(subcategories) for subcategories in SHIP_CATEGORIES.values())
+        )
     
     # Initialize result dictionary
     ship_data = {}
@@ -103,8 +112,6 @@ def load_ship_data_from_everef() -> Dict[str, Dict[str, List[Dict]]]:
                 # This is a simplified approach - in a real implementation,
                 # we would need to search for the ship by name or use a more
                 # sophisticated lookup method
-                logger.info(f"Looking up data for {ship_name}...")
-                
                 # For now, we'll just create a placeholder entry
                 # In a real implementation, this would be replaced with actual API calls
                 ship_data[category][subcategory].append({
@@ -137,6 +144,24 @@ def update_config_with_ship_data():
     logger.info("Ship data loaded, but actual type ID update not implemented yet")
     logger.info("Using existing type IDs from configuration")
 
+# Config setting holding the type IDs for each (category, subcategory) and for each category
+# as a whole (looked up when used, like enhanced_market_scanner.SHIP_TYPE_ID_SETTINGS)
+SUBCATEGORY_TYPE_ID_SETTINGS = {
+    ("Battleship", "T1"): "T1_BATTLESHIP_TYPE_IDS",
+    ("Battleship", "Black Ops"): "BLACK_OPS_TYPE_IDS",
+    ("Battleship", "Marauder"): "MARAUDER_TYPE_IDS",
+    ("Battleship", "Faction"): "FACTION_BATTLESHIP_TYPE_IDS",
+    ("Battleship", "Pirate"): "PIRATE_BATTLESHIP_TYPE_IDS",
+    ("Cruiser", "Command Ship"): "COMMAND_SHIP_TYPE_IDS",
+    ("Cruiser", "Strategic Cruiser"): "STRATEGIC_CRUISER_TYPE_IDS",
+    ("Cruiser", "Heavy Assault Cruiser"): "HAC_TYPE_IDS",
+    ("Cruiser", "Recon Ship"): "RECON_SHIP_TYPE_IDS",
+}
+CATEGORY_TYPE_ID_SETTINGS = {
+    "Battleship": "ALL_BATTLESHIP_TYPE_IDS",
+    "Cruiser": "ALL_CRUISER_TYPE_IDS",
+}
+
 def get_ship_type_ids(category: str, subcategory: Optional[str] = None) -> List[int]:
     """
     Get ship type IDs for a specific category and optional subcategory.
@@ -148,33 +173,12 @@ def get_ship_type_ids(category: str, subcategory: Optional[str] = None) -> List[
     Returns:
         List of ship type IDs
     """
-    if category == "Battleship":
-        if subcategory == "T1":
-            return config.T1_BATTLESHIP_TYPE_IDS
-        elif subcategory == "Black Ops":
-            return config.BLACK_OPS_TYPE_IDS
-        elif subcategory == "Marauder":
-            return config.MARAUDER_TYPE_IDS
-        elif subcategory == "Faction":
-            return config.FACTION_BATTLESHIP_TYPE_IDS
-        elif subcategory == "Pirate":
-            return config.PIRATE_BATTLESHIP_TYPE_IDS
-        else:
-            return config.ALL_BATTLESHIP_TYPE_IDS
-    elif category == "Cruiser":
-        if subcategory == "Command Ship":
-            return config.COMMAND_SHIP_TYPE_IDS
-        elif subcategory == "Strategic Cruiser":
-            return config.STRATEGIC_CRUISER_TYPE_IDS
-        elif subcategory == "Heavy Assault Cruiser":
-            return config.HAC_TYPE_IDS
-        elif subcategory == "Recon Ship":
-            return config.RECON_SHIP_TYPE_IDS
-        else:
-            return config.ALL_CRUISER_TYPE_IDS
-    else:
+    # Unknown or missing subcategories fall back to the whole category
+    setting = SUBCATEGORY_TYPE_ID_SETTINGS.get((category, subcategory)) or CATEGORY_TYPE_ID_SETTINGS.get(category)
+    if setting is None:
         logger.warning(f"Unknown ship category: {category}")
         return []
+    return getattr(config, setting)
 
 if __name__ == "__main__":
     # Test the module
@@ -4,6 +4,10 @@ Static dictionary of EVE Online ship hull data.
 This module provides static dictionaries of ship hull names and IDs to avoid
 making API calls to the EVE Online ESI API, which improves performance.
 """
+from collections import namedtuple
+
+# Name and UI category of a hull, as stored in SHIP_CATEGORIES
+ShipInfo = namedtuple('ShipInfo', 'name category')
 
 # T1 Battleships
 T1_BATTLESHIPS = {
@@ -112,23 +116,43 @@ RECON_SHIPS = {
     11963: "Rapier",        # Minmatar
 }
 
-# Ship categories for UI display
-SHIP_CATEGORIES = {
+# Hull groups with their UI category and hull class, in display order
+SHIP_GROUPS = (
     # Battleships
-    **{id: {"name": name, "category": "T1 Battleship"} for id, name in T1_BATTLESHIPS.items()},
-    **{id: {"name": name, "category": "Black Ops"} for id, name in BLACK_OPS.items()},
-    **{id: {"name": name, "category": "Marauder"} for id, name in MARAUDERS.items()},
-    **{id: {"name": name, "category": "Faction Battleship"} for id, name in FACTION_BATTLESHIPS.items()},
-    **{id: {"name": name, "category": "Pirate Battleship"} for id, name in PIRATE_BATTLESHIPS.items()},
+    (T1_BATTLESHIPS, "T1 Battleship", "battleship"),
+    (BLACK_OPS, "Black Ops", "battleship"),
+    (MARAUDERS, "Marauder", "battleship"),
+    (FACTION_BATTLESHIPS, "Faction Battleship", "battleship"),
+    (PIRATE_BATTLESHIPS, "Pirate Battleship", "battleship"),
     
     # Advanced Cruisers
-    **{id: {"name": name, "category": "Strategic Cruiser"} for id, name in STRATEGIC_CRUISERS.items()},
-    **{id: {"name": name, "category": "Heavy Assault Cruiser"} for id, name in HEAVY_ASSAULT_CRUISERS.items()},
-    **{id: {"name": name, "category": "Recon Ship"} for id, name in RECON_SHIPS.items()},
+    (STRATEGIC_CRUISERS, "Strategic Cruiser", "cruiser"),
+    (HEAVY_ASSAULT_CRUISERS, "Heavy Assault Cruiser", "cruiser"),
+    (RECON_SHIPS, "Recon Ship", "cruiser"),
     
     # Command Battlecruisers
-    **{id: {"name": name, "category": "Command Ship"} for id, name in COMMAND_SHIPS.items()},
-}
+    (COMMAND_SHIPS, "Command Ship", "command_ship"),
+)
+
+def _build_categories():
+    """
+    Build the hull lookup tables in one pass over the hull groups.
+    
+    Returns:
+        Tuple of (type ID -> ShipInfo dict, hull class -> list of
+        {id, name, category} dicts)
+    """
+    categories = {}
+    hulls_by_class = {}
+    for hulls, category, hull_class in SHIP_GROUPS:
+        class_hulls = hulls_by_class.setdefault(hull_class, [])
+        for type_id, name in hulls.items():
+            categories[type_id] = ShipInfo(name, category)
+            class_hulls.append({"id": type_id, "name": name, "category": category})
+    return categories, hulls_by_class
+
+# Ship categories for UI display, and the same hulls listed per hull class
+SHIP_CATEGORIES, _HULLS_BY_CLASS = _build_categories()
 
 # Helper function to get ship info by ID
 def get_ship_info(type_id):
@@ -141,11 +165,9 @@ def get_ship_info(type_id):
     Returns:
         A dictionary with the ship's name and category, or a default value if not found
     """
-    if type_id in SHIP_CATEGORIES:
-        return {
-            "name": SHIP_CATEGORIES[type_id]["name"],
-            "category": SHIP_CATEGORIES[type_id]["category"]
-        }
+    info = SHIP_CATEGORIES.get(type_id)
+    if info is not None:
+        return {"name": info.name, "category": info.category}
     return {
         "name": f"Unknown Type {type_id}",
         "category": "Unknown"
@@ -159,18 +181,7 @@ def get_all_battleships():
     Returns:
         A list of dictionaries with battleship information
     """
-    battleships = []
-    
-    # Add all battleship types
-    for type_id, info in SHIP_CATEGORIES.items():
-        if "Battleship" in info["category"] or info["category"] == "Black Ops" or info["category"] == "Marauder":
-            battleships.append({
-                "id": type_id,
-                "name": info["name"],
-                "category": info["category"]
-            })
-    
-    return battleships
+    return list(_HULLS_BY_CLASS["battleship"])
 
 # Helper function to get all advanced cruisers
 def get_all_cruisers():
@@ -180,18 +191,7 @@ def get_all_cruisers():
     Returns:
         A list of dictionaries with advanced cruiser information
     """
-    cruisers = []
-    
-    # Add all cruiser types
-    for type_id, info in SHIP_CATEGORIES.items():
-        if "Cruiser" in info["category"] or info["category"] == "Recon Ship":
-            cruisers.append({
-                "id": type_id,
-                "name": info["name"],
-                "category": info["category"]
-            })
-    
-    return cruisers
+    return list(_HULLS_BY_CLASS["cruiser"])
 
 # Helper function to get all command battlecruisers
 def get_all_command_ships():
@@ -201,15 +201,4 @@ def get_all_command_ships():
     Returns:
         A list of dictionaries with command battlecruiser information
     """
-    command_ships = []
-    
-    # Add all command ship types
-    for type_id, info in SHIP_CATEGORIES.items():
-        if info["category"] == "Command Ship":
-            command_ships.append({
-                "id": type_id,
-                "name": info["name"],
-                "category": info["category"]
-            })
-    
-    return command_ships
\ No newline at end of file
+    return list(_HULLS_BY_CLASS["command_ship"])
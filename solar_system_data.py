@@ -1,12 +1,17 @@
 """
 Solar system data loader and region discovery functionality.
 """
+import os
 import pickle
 import logging
-from typing import Dict, List, Set, TypedDict, Optional, Union
-from collections import deque
+from array import array
+from functools import lru_cache
+from typing import Dict, List, Tuple, TypedDict, Optional
+
+import numpy as np
 
 import config
+from cache import get_cache
 
 # Set up logging
 logging.basicConfig(
@@ -15,20 +20,77 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Marker in distance arrays for systems that cannot be reached through stargates
+UNREACHABLE = np.iinfo(np.uint8).max
+
+# Marks system IDs in a distance table that are not on the stargate map
+NOT_ON_MAP = -1
+
+# Arrays saved in the map arrays file in config.CACHE_DIR (besides the source file's modification time)
+MAP_ARRAY_NAMES = ('system_ids', 'offsets', 'neighbors', 'region_ids', 'names')
+
+# Lowercase system name -> system ID, per solar system data file and version, built on first lookup
+_name_indexes: Dict[Tuple[str, Optional[float]], Dict[str, int]] = {}
+
 class SolarSystem(TypedDict):
     """Type definition for solar system data."""
     solar_system_name: str
-    solar_system_id: str
+    solar_system_id: int
     region_name: str
-    region_id: str
+    region_id: int
     constellation_name: str
-    constellation_id: str
-    adjacent: List[str]  # list of all adjacent Solar Systems in the network
+    constellation_id: int
+    adjacent: List[int]  # list of all adjacent Solar Systems in the network
+
+@lru_cache(maxsize=4)
+def _read_solar_systems(filepath: str, mtime: Optional[float]) -> Dict[int, SolarSystem]:
+    """
+    Read solar system data from a pickle file, once per process, path and file version.
+    
+    Errors propagate to the caller, so a failed read is not cached and is
+    retried on the next call.
+    
+    Args:
+        filepath: Path to the pickle file containing solar system data
+        mtime: Modification time of the file; only part of the cache key, so a
+            replaced file is read again
+        
+    Returns:
+        Dictionary mapping solar system IDs to solar system data
+    """
+    logger.info(f"Attempting to load solar system data from {filepath}")
+    with open(filepath, 'rb') as f:
+        solar_systems = pickle.load(f)
+    
+    # Normalize every ID to int once, so lookups never mix string and integer keys
+    solar_systems = {
+        int(system_id): {
+            **system,
+            'solar_system_id': int(system['solar_system_id']),
+            'region_id': int(system['region_id']),
+            'constellation_id': int(system['constellation_id']),
+            'adjacent': [int(adjacent_id) for adjacent_id in system['adjacent']],
+        }
+        for system_id, system in solar_systems.items()
+    }
+    
+    # Log some sample data to verify structure
+    if solar_systems:
+        sample_key = next(iter(solar_systems))
+        logger.info(f"Sample solar system key type: {type(sample_key).__name__}")
+        logger.info(f"Sample solar system data structure: {list(solar_systems[sample_key].keys())}")
+        
+    logger.info(f"Successfully loaded {len(solar_systems)} solar systems from {filepath}")
+    return solar_systems
 
 def load_solar_systems(filepath: str) -> Dict[int, SolarSystem]:
     """
     Load solar system data from a pickle file.
     
+    The parsed data is cached, so repeated calls with the same path return the
+    same dictionary without reading the file again until it changes on disk.
+    Callers must not modify it.
+    
     Args:
         filepath: Path to the pickle file containing solar system data
         
@@ -36,18 +98,12 @@ def load_solar_systems(filepath: str) -> Dict[int, SolarSystem]:
         Dictionary mapping solar system IDs to solar system data
     """
     try:
-        logger.info(f"Attempting to load solar system data from {filepath}")
-        with open(filepath, 'rb') as f:
-            solar_systems = pickle.load(f)
-        
-        # Log some sample data to verify structure
-        if solar_systems:
-            sample_key = next(iter(solar_systems))
-            logger.info(f"Sample solar system key type: {type(sample_key).__name__}")
-            logger.info(f"Sample solar system data structure: {list(solar_systems[sample_key].keys())}")
-            
-        logger.info(f"Successfully loaded {len(solar_systems)} solar systems from {filepath}")
-        return solar_systems
+        mtime = os.path.getmtime(filepath)
+    except OSError:
+        mtime = None
+    
+    try:
+        return _read_solar_systems(filepath, mtime)
     except FileNotFoundError:
         logger.error(f"Solar system data file not found at {filepath}")
         return {}
@@ -58,154 +114,348 @@ def load_solar_systems(filepath: str) -> Dict[int, SolarSystem]:
         logger.error(f"Unexpected error loading solar system data from {filepath}: {e}")
         return {}
 
-def discover_regions_within_jumps(
-    solar_systems: Dict[int, SolarSystem], 
-    start_system_id: Union[str, int], 
-    max_jumps: int
-) -> Set[str]:
+def get_system_name_index(solar_system_data_path: str = None) -> Dict[str, int]:
     """
-    Discover all regions within a certain number of jumps from a starting system.
-    Uses Breadth-First Search (BFS) to traverse the solar system network.
+    Get the lowercase system name to system ID index, building it on first use.
+    
+    The index is built from the saved map arrays (no unpickling of the full solar system
+    data) and persisted in the on-disk cache. It is rebuilt whenever the solar system
+    data file changes.
     
     Args:
-        solar_systems: Dictionary mapping solar system IDs to solar system data
-        start_system_id: ID of the starting solar system
-        max_jumps: Maximum number of jumps to consider
+        solar_system_data_path: Path to the pickle file containing solar system data
         
     Returns:
-        Set of region IDs within the specified number of jumps
+        Dictionary mapping lowercase system names to system IDs (empty if the data is unavailable)
     """
-    # Convert start_system_id to int if it's a string
-    if isinstance(start_system_id, str):
-        try:
-            start_system_id = int(start_system_id)
-        except ValueError:
-            logger.error(f"Invalid system ID format: {start_system_id}")
-            return set()
-    
-    logger.info(f"Starting region discovery from system ID: {start_system_id}")
-    
-    if start_system_id not in solar_systems:
-        logger.error(f"Starting system ID {start_system_id} not found in solar system data")
-        logger.debug(f"Available system IDs: {list(solar_systems.keys())[:10]}...")
-        return set()
-    
-    start_system_name = solar_systems[start_system_id]['solar_system_name']
-    logger.info(f"Discovering regions within {max_jumps} jumps of {start_system_name} (ID: {start_system_id})...")
-    
-    # Set to store discovered region IDs
-    region_ids = set()
-    
-    # Set to track visited systems
-    visited = set()
-    
-    # Queue for BFS, storing (system_id, distance) pairs
-    queue = deque([(start_system_id, 0)])
-    visited.add(start_system_id)
-    
-    # Add the region of the starting system
-    start_region_id = solar_systems[start_system_id]['region_id']
-    start_region_name = solar_systems[start_system_id]['region_name']
-    region_ids.add(start_region_id)
-    logger.info(f"Added starting region: {start_region_name} (ID: {start_region_id})")
-    
-    # Track statistics for logging
-    systems_visited = 0
-    systems_by_distance = {0: 1}  # Distance -> count
-    regions_by_distance = {0: {start_region_id: start_region_name}}  # Distance -> {region_id: region_name}
-    
-    # BFS to discover regions
-    while queue:
-        system_id, distance = queue.popleft()
-        systems_visited += 1
-        
-        # If we've reached the maximum distance, don't explore further
-        if distance >= max_jumps:
-            continue
-        
-        # Get the current system
-        system = solar_systems.get(system_id)
-        if not system:
-            logger.warning(f"System ID {system_id} not found in solar system data")
-            continue
-        
-        # Add the region ID to our set if not already added
-        region_id = system['region_id']
-        region_name = system['region_name']
-        if region_id not in region_ids:
-            region_ids.add(region_id)
-            logger.info(f"Discovered new region: {region_name} (ID: {region_id}) at distance {distance}")
-            
-            # Track regions by distance for statistics
-            if distance not in regions_by_distance:
-                regions_by_distance[distance] = {}
-            regions_by_distance[distance][region_id] = region_name
-        
-        # Explore adjacent systems
-        adjacent_count = 0
-        for adjacent_id_str in system['adjacent']:
-            adjacent_id = int(adjacent_id_str)
-            if adjacent_id not in visited:
-                visited.add(adjacent_id)
-                queue.append((adjacent_id, distance + 1))
-                adjacent_count += 1
-                
-                # Track systems by distance for statistics
-                next_distance = distance + 1
-                if next_distance not in systems_by_distance:
-                    systems_by_distance[next_distance] = 0
-                systems_by_distance[next_distance] += 1
-        
-        if adjacent_count > 0:
-            logger.debug(f"Added {adjacent_count} adjacent systems from {system['solar_system_name']} (ID: {system_id})")
-    
-    # Log detailed statistics
-    logger.info(f"BFS traversal complete: visited {systems_visited} systems across {len(region_ids)} regions")
-    for distance in sorted(systems_by_distance.keys()):
-        if distance <= max_jumps:
-            logger.info(f"Systems at distance {distance}: {systems_by_distance[distance]}")
-    
-    for distance in sorted(regions_by_distance.keys()):
-        regions_at_distance = regions_by_distance[distance]
-        logger.info(f"Regions at distance {distance}: {', '.join([f'{name} ({rid})' for rid, name in regions_at_distance.items()])}")
-    
-    logger.info(f"Final result: Discovered {len(region_ids)} regions within {max_jumps} jumps of {start_system_name}")
-    return region_ids
+    solar_system_data_path = solar_system_data_path or config.SOLAR_SYSTEM_DATA_PATH
+    source_mtime = _source_mtime(solar_system_data_path)
+    name_index = _name_indexes.get((solar_system_data_path, source_mtime))
+    if name_index is not None:
+        return name_index
+    
+    # Stored as one (path, mtime, names) entry, so the index and its source are always written together
+    persisted = get_cache('system_name_index')
+    entry = persisted.get('index')
+    if source_mtime is not None and entry and entry[:2] == (solar_system_data_path, source_mtime) and entry[2]:
+        _name_indexes[(solar_system_data_path, source_mtime)] = entry[2]
+        return entry[2]
+    
+    arrays = _read_map_arrays(solar_system_data_path, source_mtime)
+    if arrays is None:
+        # Don't cache a failed load; try again on the next lookup
+        return {}
+    name_index = dict(zip(np.char.lower(arrays['names']).tolist(), arrays['system_ids'].tolist()))
+    _name_indexes.clear()
+    _name_indexes[(solar_system_data_path, source_mtime)] = name_index
+    persisted['index'] = (solar_system_data_path, source_mtime, name_index)
+    return name_index
 
-def find_system_id_by_name(solar_systems: Dict[int, SolarSystem], system_name: str) -> Optional[int]:
+def get_system_id_by_name(system_name: str, solar_system_data_path: str = None) -> Optional[int]:
     """
-    Find a system ID by its name using the solar system data.
+    Find a system ID by its name (case-insensitive) with a single index lookup.
     
     Args:
-        solar_systems: Dictionary mapping solar system IDs to solar system data
         system_name: The name of the system to find
+        solar_system_data_path: Path to the pickle file containing solar system data
         
     Returns:
         The system ID if found, or None if not found
     """
     logger.info(f"Looking up system ID for name: {system_name}")
     
-    if not solar_systems:
+    name_index = get_system_name_index(solar_system_data_path)
+    if not name_index:
         logger.warning("No solar system data available, cannot look up system by name")
         return None
     
-    # Search for the system by name (case-insensitive)
-    system_name_lower = system_name.lower()
-    for system_id, system_data in solar_systems.items():
-        if system_data['solar_system_name'].lower() == system_name_lower:
-            logger.info(f"Found system ID {system_id} for name {system_name}")
-            return system_id
+    system_id = name_index.get(system_name.lower())
+    if system_id is not None:
+        logger.info(f"Found system ID {system_id} for name {system_name}")
+        return system_id
     
     logger.warning(f"No system found with name: {system_name}")
     return None
 
-def get_regions_to_search(solar_system_data_path: str = None, reference_system_id: int = None) -> List[int]:
+def _source_mtime(solar_system_data_path: str) -> Optional[float]:
+    """Get the modification time of a solar system data file, or None if it can't be read."""
+    try:
+        return os.path.getmtime(solar_system_data_path)
+    except OSError:
+        return None
+
+def _map_arrays_path(solar_system_data_path: str) -> str:
+    """Get the path of the on-disk copy of the map arrays built from a solar system data file."""
+    return os.path.join(config.CACHE_DIR, f"{os.path.basename(solar_system_data_path)}.csr.npz")
+
+def _load_map_arrays(solar_system_data_path: str) -> Optional[Dict[str, np.ndarray]]:
+    """
+    Get the stargate network and system regions as flat numpy arrays.
+    
+    The arrays are saved to an .npz file in config.CACHE_DIR, so later runs load a few
+    contiguous arrays instead of unpickling the solar system data and walking every
+    system's adjacency list. They are kept in memory per version of the solar system
+    data file, so they (and everything derived from them) are rebuilt when it changes.
+    
+    Args:
+        solar_system_data_path: Path to the pickle file containing solar system data
+        
+    Returns:
+        See _read_map_arrays
+    """
+    return _read_map_arrays(solar_system_data_path, _source_mtime(solar_system_data_path))
+
+@lru_cache(maxsize=1)
+def _read_map_arrays(solar_system_data_path: str, source_mtime: Optional[float]) -> Optional[Dict[str, np.ndarray]]:
+    """
+    Load (or build and save) the map arrays for one version of a solar system data file.
+    
+    Args:
+        solar_system_data_path: Path to the pickle file containing solar system data
+        source_mtime: Modification time of the file (None if it can't be read)
+        
+    Returns:
+        Dictionary with 'system_ids', 'offsets' and 'neighbors' (the network in compressed
+        sparse row form: the neighbors of the system at index i are
+        neighbors[offsets[i]:offsets[i + 1]], as indexes), 'region_ids' and 'names', all
+        aligned by system index; or None if no solar system data could be loaded
+    """
+    arrays_path = _map_arrays_path(solar_system_data_path)
+    if source_mtime is not None:
+        try:
+            with np.load(arrays_path) as saved:
+                if float(saved['source_mtime']) == source_mtime:
+                    return {name: saved[name] for name in MAP_ARRAY_NAMES}
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            logger.warning(f"Could not load map arrays from {arrays_path}, rebuilding: {e}")
+    
+    solar_systems = load_solar_systems(solar_system_data_path)
+    if not solar_systems:
+        return None
+    
+    system_index = {system_id: index for index, system_id in enumerate(solar_systems)}
+    
+    offsets = np.zeros(len(system_index) + 1, dtype=np.int32)
+    neighbors = []
+    for index, system in enumerate(solar_systems.values()):
+        adjacent = [system_index[a] for a in system['adjacent'] if a in system_index]
+        neighbors.extend(adjacent)
+        offsets[index + 1] = offsets[index] + len(adjacent)
+    
+    arrays = {
+        'system_ids': np.fromiter(system_index, dtype=np.int64, count=len(system_index)),
+        'offsets': offsets,
+        'neighbors': np.array(neighbors, dtype=np.int32),
+        'region_ids': np.fromiter(
+            (system['region_id'] for system in solar_systems.values()),
+            dtype=np.int64,
+            count=len(solar_systems)
+        ),
+        'names': np.array([system['solar_system_name'] for system in solar_systems.values()], dtype=np.str_),
+    }
+    
+    if source_mtime is not None:
+        try:
+            os.makedirs(config.CACHE_DIR, exist_ok=True)
+            # Write to a temporary file first so a crash never leaves a truncated file
+            tmp_path = f"{arrays_path}.tmp"
+            with open(tmp_path, 'wb') as f:
+                np.savez(f, source_mtime=np.float64(source_mtime), **arrays)
+            os.replace(tmp_path, arrays_path)
+        except OSError as e:
+            logger.warning(f"Could not save map arrays to {arrays_path}: {e}")
+    
+    return arrays
+
+def get_system_names(solar_system_data_path: str = None) -> Dict[int, str]:
+    """
+    Get the name of every solar system, read from the saved map arrays.
+    
+    Args:
+        solar_system_data_path: Path to the pickle file containing solar system data
+        
+    Returns:
+        Dictionary mapping system IDs to system names (empty if no data is available)
+    """
+    arrays = _load_map_arrays(solar_system_data_path or config.SOLAR_SYSTEM_DATA_PATH)
+    if arrays is None:
+        return {}
+    return dict(zip(arrays['system_ids'].tolist(), arrays['names'].tolist()))
+
+@lru_cache(maxsize=1)
+def _build_stargate_graph(solar_system_data_path: str, source_mtime: Optional[float]):
+    """
+    Build a compressed sparse row (CSR) view of the stargate network.
+    
+    Args:
+        solar_system_data_path: Path to the pickle file containing solar system data
+        source_mtime: Modification time of the file (part of the cache key)
+        
+    Returns:
+        Tuple of (system ID -> index dict, offsets array, neighbors array), where the
+        neighbors of the system at index i are neighbors[offsets[i]:offsets[i + 1]].
+        Returns None if no solar system data could be loaded.
+    """
+    arrays = _read_map_arrays(solar_system_data_path, source_mtime)
+    if arrays is None:
+        return None
+    
+    system_index = {system_id: index for index, system_id in enumerate(arrays['system_ids'].tolist())}
+    return system_index, arrays['offsets'], arrays['neighbors']
+
+def get_system_index(solar_system_data_path: str = None) -> Dict[int, int]:
+    """
+    Get the mapping from system ID to position in the arrays returned by build_distance_array.
+    
+    Args:
+        solar_system_data_path: Path to the pickle file containing solar system data
+        
+    Returns:
+        Dictionary mapping system IDs to array indexes (empty if no data is available)
+    """
+    solar_system_data_path = solar_system_data_path or config.SOLAR_SYSTEM_DATA_PATH
+    graph = _build_stargate_graph(solar_system_data_path, _source_mtime(solar_system_data_path))
+    return graph[0] if graph else {}
+
+def build_distance_array(reference_system_id: int, solar_system_data_path: str = None) -> Optional[np.ndarray]:
+    """
+    Compute the stargate jump distance from a reference system to every system.
+    
+    Runs a single level-by-level BFS over the CSR stargate graph. The result is cached
+    per reference system and must not be modified.
+    
+    Args:
+        reference_system_id: ID of the reference system
+        solar_system_data_path: Path to the pickle file containing solar system data
+        
+    Returns:
+        uint8 array of jump counts indexed like get_system_index (UNREACHABLE for systems
+        with no stargate route), or None if the data or reference system is unavailable
+    """
+    solar_system_data_path = solar_system_data_path or config.SOLAR_SYSTEM_DATA_PATH
+    return _build_distance_array(reference_system_id, solar_system_data_path, _source_mtime(solar_system_data_path))
+
+@lru_cache(maxsize=8)
+def _build_distance_array(reference_system_id: int, solar_system_data_path: str, source_mtime: Optional[float]) -> Optional[np.ndarray]:
+    """Compute build_distance_array for one version of the solar system data file."""
+    graph = _build_stargate_graph(solar_system_data_path, source_mtime)
+    if graph is None:
+        return None
+    
+    system_index, offsets, neighbors = graph
+    start = system_index.get(int(reference_system_id))
+    if start is None:
+        logger.error(f"Reference system ID {reference_system_id} not found in solar system data")
+        return None
+    
+    distances = np.full(len(system_index), UNREACHABLE, dtype=np.uint8)
+    distances[start] = 0
+    frontier = np.array([start], dtype=np.int32)
+    distance = 0
+    while frontier.size:
+        distance = min(distance + 1, UNREACHABLE - 1)
+        
+        # Gather the neighbors of every system in the frontier at once
+        starts = offsets[frontier]
+        counts = offsets[frontier + 1] - starts
+        positions = np.repeat(starts - np.cumsum(counts) + counts, counts) + np.arange(counts.sum())
+        candidates = neighbors[positions]
+        
+        frontier = np.unique(candidates[distances[candidates] == UNREACHABLE])
+        distances[frontier] = distance
+    
+    logger.info(f"Computed jump distances from system {reference_system_id} to {len(system_index)} systems")
+    return distances
+
+def build_distance_table(reference_system_id: int, solar_system_data_path: str = None) -> Optional[Tuple[int, array]]:
     """
-    Get the list of region IDs to search based on the configured max jumps from the reference system.
+    Get the jump distances from a reference system as a flat table indexed by system ID.
+    
+    Looking a system up is a subtraction and a subscript, with no hashing, which suits the
+    per-order distance checks. The result is cached per reference system and must not be modified.
+    
+    Args:
+        reference_system_id: ID of the reference system
+        solar_system_data_path: Path to the pickle file containing solar system data
+        
+    Returns:
+        Tuple of (lowest system ID, array('h') of distances for consecutive IDs from it), with
+        NOT_ON_MAP for IDs that are not in the data and 999 for systems with no stargate route,
+        or None if the data or reference system is unavailable
+    """
+    solar_system_data_path = solar_system_data_path or config.SOLAR_SYSTEM_DATA_PATH
+    return _build_distance_table(reference_system_id, solar_system_data_path, _source_mtime(solar_system_data_path))
+
+@lru_cache(maxsize=8)
+def _build_distance_table(reference_system_id: int, solar_system_data_path: str, source_mtime: Optional[float]) -> Optional[Tuple[int, array]]:
+    """Build build_distance_table for one version of the solar system data file."""
+    distances = _build_distance_array(reference_system_id, solar_system_data_path, source_mtime)
+    if distances is None:
+        return None
+    
+    system_index = _build_stargate_graph(solar_system_data_path, source_mtime)[0]
+    system_ids = np.fromiter(system_index.keys(), dtype=np.int64, count=len(system_index))
+    positions = np.fromiter(system_index.values(), dtype=np.int64, count=len(system_index))
+    
+    base = int(system_ids.min())
+    table = np.full(int(system_ids.max()) - base + 1, NOT_ON_MAP, dtype=np.int16)
+    system_distances = distances[positions].astype(np.int16)
+    system_distances[system_distances == UNREACHABLE] = 999
+    table[system_ids - base] = system_distances
+    return base, array('h', table.tobytes())
+
+def _build_system_regions(solar_system_data_path: str, source_mtime: Optional[float]) -> Optional[np.ndarray]:
+    """
+    Get the system -> region lookup as an array aligned with get_system_index.
+    
+    Args:
+        solar_system_data_path: Path to the pickle file containing solar system data
+        source_mtime: Modification time of the file
+        
+    Returns:
+        int64 array of region IDs, or None if no solar system data could be loaded
+    """
+    arrays = _read_map_arrays(solar_system_data_path, source_mtime)
+    return arrays['region_ids'] if arrays is not None else None
+
+@lru_cache(maxsize=32)
+def _discover_region_ids(solar_system_data_path: str, source_mtime: Optional[float], reference_system_id: int, max_jumps: int) -> tuple:
+    """
+    Discover the region IDs within max_jumps of a reference system, caching the result.
+    
+    Selects every system whose jump distance (from build_distance_array) is at most
+    max_jumps and collects their regions in one vectorized pass. The jump range varies per
+    scan, so it is part of the cache key rather than read from config here.
+    
+    Args:
+        solar_system_data_path: Path to the pickle file containing solar system data
+        source_mtime: Modification time of the file (part of the cache key)
+        reference_system_id: ID of the reference system
+        max_jumps: Maximum number of jumps to consider
+        
+    Returns:
+        Tuple of region IDs as integers (empty if the reference system is unknown)
+    """
+    logger.info(f"Starting region discovery from reference system ID: {reference_system_id}")
+    distances = _build_distance_array(int(reference_system_id), solar_system_data_path, source_mtime)
+    system_regions = _build_system_regions(solar_system_data_path, source_mtime)
+    if distances is None or system_regions is None:
+        return ()
+    
+    region_ids = tuple(np.unique(system_regions[distances <= max_jumps]).tolist())
+    logger.info(f"Discovered {len(region_ids)} regions within {max_jumps} jumps of system {reference_system_id}")
+    return region_ids
+
+def get_regions_to_search(solar_system_data_path: str = None, reference_system_id: int = None, max_jumps: int = None) -> List[int]:
+    """
+    Get the list of region IDs to search within max jumps of the reference system.
     
     Args:
         solar_system_data_path: Path to the pickle file containing solar system data
         reference_system_id: ID of the reference system (defaults to config.REFERENCE_SYSTEM_ID)
+        max_jumps: Maximum number of jumps (defaults to config.MAX_JUMPS)
         
     Returns:
         List of region IDs to search
@@ -213,33 +463,36 @@ def get_regions_to_search(solar_system_data_path: str = None, reference_system_i
     # Use the provided paths or fall back to configured values
     solar_system_data_path = solar_system_data_path or config.SOLAR_SYSTEM_DATA_PATH
     reference_system_id = reference_system_id or config.REFERENCE_SYSTEM_ID
+    max_jumps = config.MAX_JUMPS if max_jumps is None else max_jumps
     
-    logger.info(f"Getting regions to search around system ID {reference_system_id} with max jumps {config.MAX_JUMPS}")
+    logger.info(f"Getting regions to search around system ID {reference_system_id} with max jumps {max_jumps}")
     logger.info(f"Using solar system data from: {solar_system_data_path}")
     
-    # Load solar system data
-    solar_systems = load_solar_systems(solar_system_data_path)
+    # Regions found by earlier runs for the same map, reference system and range
+    source_mtime = _source_mtime(solar_system_data_path)
+    persisted = get_cache('regions_to_search')
+    cache_key = (solar_system_data_path, source_mtime, int(reference_system_id), max_jumps)
+    if source_mtime is not None and cache_key in persisted:
+        region_ids_int = list(persisted[cache_key])
+        logger.info(f"Final regions to search (cached): {region_ids_int}")
+        return region_ids_int
     
-    if not solar_systems:
+    # Load the map (from the saved arrays when they are current)
+    if _read_map_arrays(solar_system_data_path, source_mtime) is None:
         logger.warning("No solar system data loaded, falling back to predefined regions")
         logger.info(f"Using fallback regions: {config.FALLBACK_REGION_IDS}")
         return config.FALLBACK_REGION_IDS
     
-    # Discover regions within max jumps of the reference system
-    logger.info(f"Starting region discovery from reference system ID: {reference_system_id}")
-    region_ids = discover_regions_within_jumps(
-        solar_systems, 
-        reference_system_id, 
-        config.MAX_JUMPS
-    )
-    
-    # Convert region IDs to integers
-    region_ids_int = [int(region_id) for region_id in region_ids]
+    # Discover regions within max jumps of the reference system (cached per system and jump range)
+    region_ids_int = list(_discover_region_ids(solar_system_data_path, source_mtime, reference_system_id, max_jumps))
     
     if not region_ids_int:
         logger.warning("No regions discovered, falling back to predefined regions")
         logger.info(f"Using fallback regions: {config.FALLBACK_REGION_IDS}")
         return config.FALLBACK_REGION_IDS
     
+    if source_mtime is not None:
+        persisted[cache_key] = tuple(region_ids_int)
+    
     logger.info(f"Final regions to search: {region_ids_int}")
     return region_ids_int
\ No newline at end of file
@@ -14,7 +14,6 @@ Run this script directly to start the web server:
 """
 import argparse
 import logging
-import os
 import sys
 from web_server import run_web_server
 
@@ -53,10 +52,6 @@ def main():
     # Parse arguments
     args = parser.parse_args()
     
-    # Create static and templates directories if they don't exist
-    os.makedirs('static', exist_ok=True)
-    os.makedirs('templates', exist_ok=True)
-    
     # Print startup message
     logger.info("Starting EVE Online Market Bot Web Application")
     logger.info(f"Web interface will be available at http://{args.host if args.host != '0.0.0.0' else 'localhost'}:{args.port}")
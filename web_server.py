@@ -7,18 +7,23 @@ This module provides a web interface for the market bot, allowing users to:
 3. Set the maximum number of jumps
 4. Run the market scanner and view the results
 """
-import json
+import gzip
 import logging
 import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from flask import Flask, request, jsonify, render_template, send_from_directory
+
+import orjson
+from flask import Flask, Response, request, render_template
 from flask_cors import CORS
 
 from enhanced_market_scanner import EnhancedMarketScanner
 import config
-from esi_client import ESIClient
-from solar_system_data import load_solar_systems
+from solar_system_data import get_system_names
+from esi_client import get_system_name, get_esi_client
 from main import resolve_reference_system, parse_hull_ids
+from deals_file import write_deals_file
 from ship_hulls import get_all_battleships, get_all_cruisers, get_all_command_ships, get_ship_info
 
 # Set up logging
@@ -36,58 +41,107 @@ CORS(app)  # Enable CORS for all routes
 os.makedirs('static', exist_ok=True)
 os.makedirs('templates', exist_ok=True)
 
+# Writes deal files in the background so scan responses don't wait on disk I/O
+_deal_writer = ThreadPoolExecutor(max_workers=2, thread_name_prefix="deal-writer")
+
+def _json_response(obj) -> Response:
+    """Serialize an object to a JSON response with orjson."""
+    return Response(orjson.dumps(obj), mimetype='application/json')
+
+# Serialized /api/systems response as (solar system data path, modification time, JSON, gzipped JSON).
+# Replaced with a single assignment, so request threads always see a consistent tuple.
+_systems_json = None
+_systems_json_lock = threading.Lock()
+
+def _systems_response(body: bytes, body_gz: bytes) -> Response:
+    """Build the /api/systems response from the cached body, gzipped if the client accepts it."""
+    headers = {'Cache-Control': 'public, max-age=3600', 'Vary': 'Accept-Encoding'}
+    if 'gzip' in request.accept_encodings:
+        headers['Content-Encoding'] = 'gzip'
+        body = body_gz
+    return Response(body, mimetype='application/json', headers=headers)
+
+def _build_systems_json(source_key):
+    """
+    Serialize and compress the solar system list for /api/systems and cache it.
+    
+    Must be called with _systems_json_lock held.
+    
+    Args:
+        source_key: (solar system data path, modification time) the list is built from
+        
+    Returns:
+        The new cache tuple, or None if no solar system data is available
+    """
+    global _systems_json
+    system_names = get_system_names(source_key[0])
+    
+    if not system_names:
+        return None
+    
+    # Convert to a list of system names and IDs
+    systems_list = [
+        {
+            'id': system_id,
+            'name': system_name
+        }
+        for system_id, system_name in system_names.items()
+    ]
+    
+    # Sort by name
+    systems_list.sort(key=lambda x: x['name'])
+    
+    # The list only changes with the data file, so serialize and compress it once
+    body = orjson.dumps(systems_list)
+    _systems_json = (*source_key, body, gzip.compress(body))
+    return _systems_json
+
 @app.route('/')
 def index():
     """Render the main page."""
     return render_template('index.html')
 
-@app.route('/static/<path:path>')
-def serve_static(path):
-    """Serve static files."""
-    return send_from_directory('static', path)
-
 @app.route('/api/battleships', methods=['GET'])
 def get_battleships():
     """Get the list of all battleship hulls."""
     # Use the static data instead of making API calls
     battleships = get_all_battleships()
-    return jsonify(battleships)
+    return _json_response(battleships)
 
 @app.route('/api/cruisers', methods=['GET'])
 def get_cruisers():
     """Get the list of all advanced cruiser hulls."""
     # Use the static data instead of making API calls
     cruisers = get_all_cruisers()
-    return jsonify(cruisers)
+    return _json_response(cruisers)
 
 @app.route('/api/command_ships', methods=['GET'])
 def get_command_ships():
     """Get the list of all command battlecruiser hulls."""
     # Use the static data instead of making API calls
     command_ships = get_all_command_ships()
-    return jsonify(command_ships)
+    return _json_response(command_ships)
 
 @app.route('/api/systems', methods=['GET'])
 def get_systems():
     """Get a list of solar systems for the autocomplete."""
-    solar_systems = load_solar_systems(config.SOLAR_SYSTEM_DATA_PATH)
-    
-    if not solar_systems:
-        return jsonify([])
-    
-    # Convert to a list of system names and IDs
-    systems_list = [
-        {
-            'id': system_id,
-            'name': system_data['solar_system_name']
-        }
-        for system_id, system_data in solar_systems.items()
-    ]
-    
-    # Sort by name
-    systems_list.sort(key=lambda x: x['name'])
-    
-    return jsonify(systems_list)
+    try:
+        source_mtime = os.path.getmtime(config.SOLAR_SYSTEM_DATA_PATH)
+    except OSError:
+        source_mtime = None
+    source_key = (config.SOLAR_SYSTEM_DATA_PATH, source_mtime)
+    
+    cached = _systems_json
+    if cached is None or cached[:2] != source_key:
+        # Build under the lock so concurrent first requests serialize the list only once
+        with _systems_json_lock:
+            cached = _systems_json
+            if cached is None or cached[:2] != source_key:
+                cached = _build_systems_json(source_key)
+    
+    if cached is None:
+        return _json_response([])
+    return _systems_response(cached[2], cached[3])
 
 @app.route('/api/scan', methods=['POST'])
 def run_scan():
@@ -105,77 +159,87 @@ def run_scan():
     
     # If we couldn't resolve the system, use the default
     if reference_system_id is None and system_input is not None:
-        return jsonify({
+        return _json_response({
             'error': f"Could not resolve system: {system_input}"
         }), 400
     
-    # If a reference system ID is provided, update the config
-    if reference_system_id:
-        config.REFERENCE_SYSTEM_ID = reference_system_id
-        # Get the system name from the ESI API
-        esi_client = ESIClient()
-        system_info = esi_client.get_system_info(reference_system_id)
-        config.REFERENCE_SYSTEM_NAME = system_info.get('name', f'System {reference_system_id}')
+    # Scan parameters are per request; the global config only supplies the defaults,
+    # so concurrent scans cannot see each other's settings
+    reference_system_id = reference_system_id or config.REFERENCE_SYSTEM_ID
+    if reference_system_id == config.REFERENCE_SYSTEM_ID:
+        reference_system_name = config.REFERENCE_SYSTEM_NAME
+    else:
+        # Get the system name (cached on disk, ESI API on first lookup)
+        reference_system_name = get_system_name(reference_system_id)
     
-    # If max_jumps is provided, update the config
-    if max_jumps is not None:
-        config.MAX_JUMPS = int(max_jumps)
-        logger.info(f"Maximum jumps set to {config.MAX_JUMPS}")
+    max_jumps = int(max_jumps) if max_jumps is not None else config.MAX_JUMPS
+    logger.info(f"Maximum jumps set to {max_jumps}")
     
     # Parse hull IDs if specified
     hull_ids = None
     if hull_ids_str:
         hull_ids = parse_hull_ids(hull_ids_str)
         if hull_ids is None:
-            return jsonify({
+            return _json_response({
                 'error': f"Invalid hull IDs format: {hull_ids_str}"
             }), 400
-        
-        # Update the config with the selected hull IDs
-        if ship_type == 'battleship':
-            config.T1_BATTLESHIP_TYPE_IDS = hull_ids
-            config.ALL_BATTLESHIP_TYPE_IDS = hull_ids
-            logger.info(f"Using custom battleship hull type IDs: {hull_ids}")
-        elif ship_type == 'cruiser':
-            config.ALL_CRUISER_TYPE_IDS = hull_ids
-            logger.info(f"Using custom cruiser hull type IDs: {hull_ids}")
-        elif ship_type == 'command_ship':
-            config.ALL_COMMAND_SHIP_TYPE_IDS = hull_ids
-            logger.info(f"Using custom command ship hull type IDs: {hull_ids}")
-    
-    logger.info(f"Starting market scan for {config.REFERENCE_SYSTEM_NAME}...")
-    
-    # Create an enhanced market scanner with the reference system
+        logger.info(f"Using custom {ship_type} hull type IDs: {hull_ids}")
+    
+    logger.info(f"Starting market scan for {reference_system_name}...")
+    
+    # Create an enhanced market scanner with this request's reference system, range and hulls
     scanner = EnhancedMarketScanner(
-        reference_system_id=config.REFERENCE_SYSTEM_ID,
-        reference_system_name=config.REFERENCE_SYSTEM_NAME,
-        use_everef=True  # Use EVERef market data for faster retrieval
+        reference_system_id=reference_system_id,
+        reference_system_name=reference_system_name,
+        use_everef=True,  # Use EVERef market data for faster retrieval
+        esi_client=get_esi_client(),  # Reuse the process-wide client and its connection pool
+        max_jumps=max_jumps,
+        hull_ids=hull_ids
     )
     
     # Find good deals
     good_deals = scanner.find_good_deals(ship_type=ship_type)
     
-    # Save the deals to a JSON file
+    # Save the deals to an NDJSON file
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    filename = f"deals_{config.REFERENCE_SYSTEM_NAME.lower()}_{timestamp}.json"
+    filename = f"deals_{reference_system_name.lower()}_{timestamp}.ndjson"
     
-    with open(filename, 'w') as f:
-        json.dump(good_deals, f, indent=2)
+    # Serialize each deal once, for both the file and the response
+    deals_json = [orjson.dumps(deal) for deal in good_deals]
     
-    logger.info(f"Saved deals to {filename}")
+    # NDJSON: one compact deal per line, so readers can stream it
+    payload = b''.join(deal_json + b'\n' for deal_json in deals_json)
+    _deal_writer.submit(write_deals_file, filename, payload)
     
-    return jsonify({
-        'deals': good_deals,
-        'reference_system': config.REFERENCE_SYSTEM_NAME,
-        'max_jumps': config.MAX_JUMPS,
+    summary = orjson.dumps({
+        'reference_system': reference_system_name,
+        'max_jumps': max_jumps,
         'hull_ids': hull_ids,
         'ship_type': ship_type
     })
+    
+    # The deals are already serialized for the file, so splice the same bytes into the
+    # response instead of serializing them again (the summary's leading '{' is replaced)
+    body = b'{"deals":[' + b','.join(deals_json) + b'],' + summary[1:]
+    return Response(body, mimetype='application/json')
 
 def run_web_server(host='0.0.0.0', port=5000, debug=False):
-    """Run the web server."""
+    """
+    Run the web server.
+    
+    Outside debug mode the app is served by waitress, a multi-threaded production WSGI
+    server, when it is installed; otherwise Flask's threaded development server is used.
+    """
     logger.info(f"Starting EVE Online Market Bot web server on {host}:{port}...")
-    app.run(host=host, port=port, debug=debug)
+    if not debug:
+        try:
+            from waitress import serve
+        except ImportError:
+            logger.info("waitress not installed, using the Flask development server")
+        else:
+            serve(app, host=host, port=port, threads=max(4, os.cpu_count() or 1))
+            return
+    app.run(host=host, port=port, debug=debug, threaded=True)
 
 if __name__ == "__main__":
     run_web_server(debug=True)
\ No newline at end of file
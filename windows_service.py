@@ -37,7 +37,6 @@ class MarketBotService(win32serviceutil.ServiceFramework):
         self.stop_event = win32event.CreateEvent(None, 0, 0, None)
         socket.setdefaulttimeout(60)
         self.service_manager = None
-        self.is_alive = True
     
     def SvcStop(self):
         """Stop the service."""
@@ -46,8 +45,6 @@ class MarketBotService(win32serviceutil.ServiceFramework):
         
         if self.service_manager:
             self.service_manager.stop()
-        
-        self.is_alive = False
     
     def SvcDoRun(self):
         """Run the service."""
@@ -66,11 +63,8 @@ class MarketBotService(win32serviceutil.ServiceFramework):
         service_thread.daemon = True
         service_thread.start()
         
-        # Wait for the stop event
-        while self.is_alive:
-            rc = win32event.WaitForSingleObject(self.stop_event, 5000)
-            if rc == win32event.WAIT_OBJECT_0:
-                break
+        # Wait for the stop event (SvcStop sets it)
+        win32event.WaitForSingleObject(self.stop_event, win32event.INFINITE)
         
         servicemanager.LogMsg(
             servicemanager.EVENTLOG_INFORMATION_TYPE,